@@ -0,0 +1,38 @@
+{#
+    Hash-based change detection for snapshots.
+
+    row_hash_expression: md5 over the given columns, NULLs kept distinct from empty strings.
+    src/init_postgres.py --row-hash keeps a row_hash column on the source tables with
+    the same expression, in a BEFORE INSERT OR UPDATE trigger.
+
+    snapshot_columns: selects the key, the columns and their row_hash. With the
+    precomputed_row_hash var, the row_hash column kept by that trigger is read instead.
+
+    create_row_hash_index: index on (key, row_hash) over the current snapshot rows,
+    used as a post-hook so change detection is one indexed hash comparison per row.
+#}
+
+{% macro row_hash_expression(columns) -%}
+    MD5(CONCAT_WS('|', {% for column in columns -%}
+        COALESCE(CAST({{ column }} AS TEXT), '\N')
+        {%- if not loop.last %}, {% endif %}
+    {%- endfor %}))
+{%- endmacro %}
+
+{% macro snapshot_columns(unique_key, columns) -%}
+    {{ unique_key }},
+    {% for column in columns -%}
+        {{ column }},
+    {% endfor -%}
+    {% if var('precomputed_row_hash') -%}
+        row_hash
+    {%- else -%}
+        {{ row_hash_expression(columns) }} AS row_hash
+    {%- endif %}
+{%- endmacro %}
+
+{% macro create_row_hash_index(unique_key) -%}
+    CREATE INDEX IF NOT EXISTS {{ this.identifier }}_row_hash_idx
+    ON {{ this }} ({{ unique_key }}, row_hash)
+    WHERE dbt_valid_to IS NULL
+{%- endmacro %}
@@ -0,0 +1,26 @@
+{% snapshot accounts_snapshot %}
+
+{{
+    config(
+        unique_key="account_code",
+        strategy="check",
+        check_cols=["row_hash"],
+        post_hook="{{ create_row_hash_index('account_code') }}",
+    )
+}}
+
+SELECT
+    {{
+        snapshot_columns(
+            'account_code',
+            [
+                'account_name',
+                'account_type',
+                'reporting_group',
+                'is_pl_account',
+            ],
+        )
+    }}
+FROM {{ source('mock_data', 'accounts') }}
+
+{% endsnapshot %}
@@ -0,0 +1,25 @@
+{% snapshot business_central_global_customers_snapshot %}
+
+{{
+    config(
+        unique_key="id",
+        strategy="check",
+        check_cols=["row_hash"],
+        post_hook="{{ create_row_hash_index('id') }}",
+    )
+}}
+
+SELECT
+    {{
+        snapshot_columns(
+            'id',
+            [
+                'account_number',
+                'currency',
+                'country_code',
+            ],
+        )
+    }}
+FROM {{ source('mock_data', 'business_central_global_customers') }}
+
+{% endsnapshot %}
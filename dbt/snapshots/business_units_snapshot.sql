@@ -0,0 +1,25 @@
+{% snapshot business_units_snapshot %}
+
+{{
+    config(
+        unique_key="business_unit",
+        strategy="check",
+        check_cols=["row_hash"],
+        post_hook="{{ create_row_hash_index('business_unit') }}",
+    )
+}}
+
+SELECT
+    {{
+        snapshot_columns(
+            'business_unit',
+            [
+                'description',
+                'unit_type',
+                'manager',
+            ],
+        )
+    }}
+FROM {{ source('mock_data', 'business_units') }}
+
+{% endsnapshot %}
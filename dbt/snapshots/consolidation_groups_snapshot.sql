@@ -0,0 +1,25 @@
+{% snapshot consolidation_groups_snapshot %}
+
+{{
+    config(
+        unique_key="consolidation_group",
+        strategy="check",
+        check_cols=["row_hash"],
+        post_hook="{{ create_row_hash_index('consolidation_group') }}",
+    )
+}}
+
+SELECT
+    {{
+        snapshot_columns(
+            'consolidation_group',
+            [
+                'description',
+                'group_type',
+                'lead_entity',
+            ],
+        )
+    }}
+FROM {{ source('mock_data', 'consolidation_groups') }}
+
+{% endsnapshot %}
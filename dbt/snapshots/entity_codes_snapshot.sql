@@ -0,0 +1,24 @@
+{% snapshot entity_codes_snapshot %}
+
+{{
+    config(
+        unique_key="entity_code",
+        strategy="check",
+        check_cols=["row_hash"],
+        post_hook="{{ create_row_hash_index('entity_code') }}",
+    )
+}}
+
+SELECT
+    {{
+        snapshot_columns(
+            'entity_code',
+            [
+                'description',
+                'created_at',
+            ],
+        )
+    }}
+FROM {{ source('mock_data', 'entity_codes') }}
+
+{% endsnapshot %}
@@ -0,0 +1,29 @@
+{% snapshot salesforce_customers_snapshot %}
+
+{{
+    config(
+        unique_key="id",
+        strategy="check",
+        check_cols=["row_hash"],
+        post_hook="{{ create_row_hash_index('id') }}",
+    )
+}}
+
+SELECT
+    {{
+        snapshot_columns(
+            'id',
+            [
+                'is_deleted',
+                'account_number',
+                'name',
+                'billing_country',
+                'capacity_s',
+                'capacity_m',
+                'capacity_l',
+            ],
+        )
+    }}
+FROM {{ source('mock_data', 'salesforce_customers') }}
+
+{% endsnapshot %}
@@ -0,0 +1,25 @@
+{% snapshot territories_snapshot %}
+
+{{
+    config(
+        unique_key="territory",
+        strategy="check",
+        check_cols=["row_hash"],
+        post_hook="{{ create_row_hash_index('territory') }}",
+    )
+}}
+
+SELECT
+    {{
+        snapshot_columns(
+            'territory',
+            [
+                'description',
+                'region',
+                'country_group',
+            ],
+        )
+    }}
+FROM {{ source('mock_data', 'territories') }}
+
+{% endsnapshot %}
@@ -0,0 +1,320 @@
+"""
+Benchmarks the dbt models against mock datasets of increasing size.
+
+- Starts a throwaway PostgreSQL container (or uses the DSN given with --dsn). Every dataset size drops and
+  reloads the mock_data source tables (CASCADE, so dbt views on them go too); an existing database is only
+  used when --allow-drop is given as well.
+- For every dataset size, generates mock data with build_mock and loads it with init_postgres.
+- Runs `dbt run` once per model and reads the per-model wall time from target/run_results.json.
+- Captures EXPLAIN (ANALYZE, BUFFERS) plans for the compiled SQL of every model.
+- Writes a JSON report with the raw numbers and plans, plus a markdown summary comparing sizes.
+
+Usage:
+    $ python src/benchmark_models.py --sizes 500 2000 10000 --output bench
+
+Author: Mews.FnO.Data
+"""
+
+import argparse
+import datetime
+import json
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+import psycopg2
+
+import build_mock
+import init_postgres
+
+DBT_DIR: Path = Path(__file__).resolve().parent.parent / "dbt"
+DBT_PROFILE: str = "mews_dbt"
+DBT_TARGET: str = "bench"
+DBT_SCHEMA: str = "bench"
+
+CONTAINER_NAME: str = "fno_bench_pg"
+CONTAINER_IMAGE: str = "postgres:15"
+CONTAINER_PORT: int = 5466
+
+# The mock_data source is pinned to the proddb database, so the benchmark database uses the same name.
+DB_NAME: str = init_postgres.DB_NAME
+DB_USER: str = init_postgres.DB_USER
+DB_PASS: str = init_postgres.DB_PASS
+
+SOURCE_TABLES: list[str] = list(init_postgres.TABLES)
+
+DEFAULT_SIZES: list[int] = [500, 2000, 10000]
+
+
+def start_postgres(port: int = CONTAINER_PORT) -> str:
+    """Start a local PostgreSQL container for the benchmark and return its DSN."""
+    subprocess.run(["docker", "rm", "-f", CONTAINER_NAME], capture_output=True, check=False)
+    subprocess.run(
+        [
+            "docker",
+            "run",
+            "-d",
+            "--rm",
+            "--name",
+            CONTAINER_NAME,
+            "-e",
+            f"POSTGRES_PASSWORD={DB_PASS}",
+            "-e",
+            f"POSTGRES_USER={DB_USER}",
+            "-e",
+            f"POSTGRES_DB={DB_NAME}",
+            "-p",
+            f"{port}:5432",
+            CONTAINER_IMAGE,
+        ],
+        check=True,
+    )
+    print("Waiting for PostgreSQL to be ready...")
+    for _ in range(120):
+        ready = subprocess.run(
+            ["docker", "exec", CONTAINER_NAME, "pg_isready", "-h", "localhost", "-U", DB_USER],
+            capture_output=True,
+            check=False,
+        )
+        if ready.returncode == 0:
+            break
+        time.sleep(1)
+    else:
+        raise Exception(f"PostgreSQL container {CONTAINER_NAME} did not become ready")
+
+    return f"host=localhost port={port} dbname={DB_NAME} user={DB_USER} password={DB_PASS}"
+
+
+def stop_postgres() -> None:
+    """Stop the benchmark PostgreSQL container (it is started with --rm)."""
+    subprocess.run(["docker", "stop", CONTAINER_NAME], capture_output=True, check=False)
+
+
+def write_profile(profiles_dir: Path, dsn: str) -> None:
+    """Write a profiles.yml pointing the mews_dbt profile at the benchmark database."""
+    params = psycopg2.extensions.parse_dsn(dsn)
+    profile = {
+        DBT_PROFILE: {
+            "target": DBT_TARGET,
+            "outputs": {
+                DBT_TARGET: {
+                    "type": "postgres",
+                    "host": params.get("host", "localhost"),
+                    "port": int(params.get("port", 5432)),
+                    "user": params.get("user", DB_USER),
+                    "password": params.get("password", DB_PASS),
+                    "dbname": params.get("dbname", DB_NAME),
+                    "schema": DBT_SCHEMA,
+                    "threads": 1,
+                }
+            },
+        }
+    }
+    # JSON is valid YAML, which saves a dependency on PyYAML.
+    (profiles_dir / "profiles.yml").write_text(json.dumps(profile, indent=2), encoding="utf-8")
+
+
+def list_models(dbt_dir: Path = DBT_DIR) -> list[str]:
+    """List the model names of the dbt project (one per .sql file under models/)."""
+    return sorted(path.stem for path in (dbt_dir / "models").rglob("*.sql"))
+
+
+def load_dataset(dsn: str, num_customers: int, work_dir: Path) -> dict[str, int]:
+    """Generate a dataset of the given size, reload it into the database and return row counts."""
+    data_path = work_dir / f"mock_data_{num_customers}.json"
+    build_mock.routine(
+        num_customers=num_customers,
+        num_journal_entries=max(500, num_customers // 4),
+        output_path=str(data_path),
+        write_indexes=False,
+    )
+
+    conn = init_postgres.get_conn(dsn)
+    cur = conn.cursor()
+    for table in SOURCE_TABLES:
+        cur.execute(f"DROP TABLE IF EXISTS {table} CASCADE")
+    conn.commit()
+
+    init_postgres.main(data_path=str(data_path), dsn=dsn)
+
+    row_counts: dict[str, int] = {}
+    conn.autocommit = True
+    for table in SOURCE_TABLES:
+        cur.execute(f"ANALYZE {table}")
+        cur.execute(f"SELECT count(*) FROM {table}")
+        row_counts[table] = cur.fetchone()[0]
+    cur.close()
+    conn.close()
+    return row_counts
+
+
+def run_model(model: str, profiles_dir: Path, target_path: Path) -> dict[str, Any]:
+    """Run a single model with `dbt run` and return its entry from run_results.json."""
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [
+            "dbt",
+            "run",
+            "--select",
+            model,
+            "--project-dir",
+            str(DBT_DIR),
+            "--profiles-dir",
+            str(profiles_dir),
+            "--target",
+            DBT_TARGET,
+            "--target-path",
+            str(target_path),
+        ],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    wall_time = time.perf_counter() - started
+
+    run_results_path = target_path / "run_results.json"
+    if not run_results_path.exists():
+        return {
+            "status": "error",
+            "message": completed.stdout[-2000:] + completed.stderr[-2000:],
+            "invocation_seconds": wall_time,
+        }
+
+    with open(run_results_path, "r", encoding="utf-8") as f:
+        run_results = json.load(f)
+
+    result = next(
+        (r for r in run_results["results"] if r["unique_id"].split(".")[-1] == model),
+        None,
+    )
+    if result is None:
+        return {"status": "skipped", "message": "model not in run results", "invocation_seconds": wall_time}
+
+    compiled_code: Optional[str] = result.get("compiled_code")
+    if not compiled_code:
+        compiled_files = list((target_path / "compiled").rglob(f"{model}.sql"))
+        if compiled_files:
+            compiled_code = compiled_files[0].read_text(encoding="utf-8")
+
+    return {
+        "status": result["status"],
+        "message": result.get("message"),
+        "execution_time": result["execution_time"],
+        "invocation_seconds": wall_time,
+        "relation_name": result.get("relation_name"),
+        "compiled_code": compiled_code,
+    }
+
+
+def explain_analyze(dsn: str, sql: str) -> dict[str, Any]:
+    """Run EXPLAIN (ANALYZE, BUFFERS) on a compiled model and return the JSON plan with headline numbers."""
+    conn = init_postgres.get_conn(dsn)
+    cur = conn.cursor()
+    try:
+        cur.execute(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql.strip().rstrip(';')}")
+        plan = cur.fetchone()[0][0]
+    finally:
+        # EXPLAIN ANALYZE executes the statement; never keep its side effects.
+        conn.rollback()
+        cur.close()
+        conn.close()
+
+    top = plan["Plan"]
+    return {
+        "planning_ms": plan.get("Planning Time"),
+        "execution_ms": plan.get("Execution Time"),
+        "shared_hit_blocks": top.get("Shared Hit Blocks"),
+        "shared_read_blocks": top.get("Shared Read Blocks"),
+        "plan": plan,
+    }
+
+
+def write_report(results: list[dict[str, Any]], output_dir: Path) -> None:
+    """Write the raw results as JSON and a markdown table comparing models across sizes."""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    with open(output_dir / "benchmark.json", "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=4, default=str)
+
+    lines = [
+        f"# dbt model benchmark ({datetime.datetime.now():%Y-%m-%d %H:%M})",
+        "",
+        "| model | customers | ledger rows | status | dbt seconds | explain ms | shared hit | shared read |",
+        "|---|---|---|---|---|---|---|---|",
+    ]
+    for size_result in results:
+        for model, model_result in sorted(size_result["models"].items()):
+            explain = model_result.get("explain") or {}
+            lines.append(
+                f"| {model} | {size_result['num_customers']} | {size_result['row_counts'].get('ledger')} "
+                f"| {model_result['status']} | {_fmt(model_result.get('execution_time'))} "
+                f"| {_fmt(explain.get('execution_ms'))} | {explain.get('shared_hit_blocks', '')} "
+                f"| {explain.get('shared_read_blocks', '')} |"
+            )
+    (output_dir / "benchmark.md").write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def _fmt(value: Optional[float]) -> str:
+    return "" if value is None else f"{value:.3f}"
+
+
+def benchmark(dsn: str, sizes: list[int], models: list[str], output_dir: Path) -> list[dict[str, Any]]:
+    """Load every dataset size, run and explain every model, and write the report."""
+    results: list[dict[str, Any]] = []
+    with tempfile.TemporaryDirectory(prefix="fno_bench_") as tmp:
+        work_dir = Path(tmp)
+        write_profile(work_dir, dsn)
+        for num_customers in sizes:
+            print(f"Loading dataset with {num_customers} customers...")
+            row_counts = load_dataset(dsn, num_customers, work_dir)
+            size_result: dict[str, Any] = {
+                "num_customers": num_customers,
+                "row_counts": row_counts,
+                "models": {},
+            }
+            for model in models:
+                print(f"  dbt run --select {model}")
+                model_result = run_model(model, work_dir, work_dir / f"target_{num_customers}_{model}")
+                if model_result["status"] == "success" and model_result.get("compiled_code"):
+                    model_result["explain"] = explain_analyze(dsn, model_result["compiled_code"])
+                size_result["models"][model] = model_result
+            results.append(size_result)
+
+    write_report(results, output_dir)
+    return results
+
+
+def main() -> None:
+    """Parse arguments, start PostgreSQL if needed and run the benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark dbt models on mock datasets of several sizes.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Customer counts to generate.")
+    parser.add_argument("--models", nargs="+", default=None, help="Models to run (default: all).")
+    parser.add_argument(
+        "--dsn",
+        default=None,
+        help="Use an existing database instead of starting a container. Its source tables are DROPPED "
+        "(CASCADE) and reloaded for every size, so this requires --allow-drop.",
+    )
+    parser.add_argument(
+        "--allow-drop",
+        action="store_true",
+        help="Confirm that the source tables of the --dsn database may be dropped.",
+    )
+    parser.add_argument("--output", default="bench_output", help="Directory for benchmark.json / benchmark.md.")
+    args = parser.parse_args()
+    if args.dsn and not args.allow_drop:
+        parser.error("--dsn drops and reloads the source tables of that database; add --allow-drop to confirm")
+
+    models = args.models or list_models()
+    dsn = args.dsn or start_postgres()
+    try:
+        benchmark(dsn, args.sizes, models, Path(args.output))
+    finally:
+        if not args.dsn:
+            stop_postgres()
+    print(f"Benchmark report written to {args.output}/benchmark.md")
+
+
+if __name__ == "__main__":
+    main()
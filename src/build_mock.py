@@ -8,8 +8,13 @@ Functions:
     generate_hotel_name: Generate a random hotel name.
     build_salesforce: Build a Salesforce customer record, with some missing fields at random.
     build_businesscentral: Build Business Central customers, including some not in Salesforce.
+    build_ledger_line: Build a single ledger line for a customer, journal, account and month.
+    build_customer_dims: Pick the entity structure a customer posts under.
+    ledger_months: List the last months ("YYYY-MM") covered by the ledger.
     build_ledger: Build a general ledger for BC customers with IX codes for revenue.
     build_fx_rates: Build a table of FX rates for all currencies (except EUR, which is always 1.0)
+    write_indexed: Write rows as JSON lines plus per-key byte-offset index files.
+    lookup: Read the rows for one key of an index by seeking into the JSON lines file.
     routine: Generate and export all mock data.
 
 Variables:
@@ -20,6 +25,8 @@ Variables:
     SALESFORCE_ID_LENGTH: Length of Salesforce ID.
     ADJECTIVES: List of adjectives.
     NOUNS: List of nouns.
+    INDEX_KEYS: Keys the JSON lines data files are indexed by.
+    SMALL_TABLES_FILE: File next to mock_data.json holding every table that has no JSON lines file.
 
 Usage:
     $ python build_mock.py
@@ -202,6 +209,25 @@ ACCOUNT_DIM = [
     },
 ]
 
+# Data file name -> index name -> key of a row, for the JSON lines files and indexes written next to mock_data.json
+INDEX_KEYS: dict[str, dict[str, typing.Callable[[dict], typing.Any]]] = {
+    "ledger_lines": {
+        "account_number": lambda row: row["account_number"],
+        "month": lambda row: row["date"][:7],
+        "journal_id": lambda row: row["journal_id"],
+    },
+    "salesforce_customers": {
+        "account_number": lambda row: row["account_number"],
+    },
+    "business_central_global_customers": {
+        "account_number": lambda row: row["account_number"],
+    },
+}
+
+# Holds the tables without a JSON lines file, in the layout of mock_data.json, so loaders that stream the
+# JSON lines files do not have to parse mock_data.json for them.
+SMALL_TABLES_FILE: str = "small_tables.json"
+
 # FUNCTIONS
 
 
@@ -277,11 +303,14 @@ def build_salesforce(account_number: int) -> dict[str, typing.Any]:
 
 
 def build_businesscentral(
-    account_number: int, sf_account_numbers: set[int]
+    account_number: int,
+    sf_account_numbers: set[int],
+    max_account_number: int = ACCOUNT_NUMBER_RANGE["max"],
 ) -> dict[str, str]:
     """
     Build a Business Central global customer.
     ~10% of customers will have account numbers not in Salesforce.
+    Those are drawn from [ACCOUNT_NUMBER_RANGE["min"], max_account_number + 1000].
 
     Returns:
         dict[str, str]: A Business Central global customer record.
@@ -299,7 +328,7 @@ def build_businesscentral(
     if random.random() < 0.10:
         while True:
             fake_account = random.randint(
-                ACCOUNT_NUMBER_RANGE["min"], ACCOUNT_NUMBER_RANGE["max"] + 1000
+                ACCOUNT_NUMBER_RANGE["min"], max_account_number + 1000
             )
             if fake_account not in sf_account_numbers:
                 account_number = fake_account
@@ -425,6 +454,70 @@ def build_consolidation_groups_table(
     ]
 
 
+def build_ledger_line(
+    customer_dims: dict[str, typing.Any],
+    journal_id: str,
+    account_code: str,
+    month: str,
+    is_adjustment_entry: typing.Optional[bool] = None,
+    amount: typing.Optional[float] = None,
+) -> dict[str, typing.Any]:
+    """
+    Build a single ledger line for a customer in a given month ("YYYY-MM").
+    customer_dims holds account_number, entity_code, territory, business_unit and consolidation_group.
+    The adjustment flag and amount are drawn at random unless given.
+    """
+    year, m = map(int, month.split("-"))
+    day = random.randint(1, 28)
+    date = f"{year}-{m:02d}-{day:02d}"
+    currency = random.choice(CURRENCIES)
+    if amount is None:
+        amount = round(random.uniform(100, 10000), 2)
+    if is_adjustment_entry is None:
+        is_adjustment_entry = random.random() < 0.05
+    is_manual = random.random() < 0.1
+    return {
+        "id": str(uuid.uuid4()),
+        "journal_id": journal_id,
+        "account_number": customer_dims["account_number"],
+        "account_code": account_code,
+        "date": date,
+        "currency": currency,
+        "amount": amount,
+        "entity_code": customer_dims["entity_code"],
+        "territory": customer_dims["territory"],
+        "business_unit": customer_dims["business_unit"],
+        "consolidation_group": customer_dims["consolidation_group"],
+        "is_adjustment_entry": is_adjustment_entry,
+        "is_manual": is_manual,
+    }
+
+
+def build_customer_dims(account_number: int) -> dict[str, typing.Any]:
+    """
+    Pick the entity structure (entity, territory, business unit, consolidation group) a customer posts under.
+    """
+    return {
+        "account_number": account_number,
+        "entity_code": random.choice(ENTITY_CODES),
+        "territory": random.choice(TERRITORIES),
+        "business_unit": random.choice(BUSINESS_UNITS),
+        "consolidation_group": random.choice(CONSOLIDATION_GROUPS),
+    }
+
+
+def ledger_months(num_months: int = 5) -> list[str]:
+    """
+    List the last num_months months ("YYYY-MM"), most recent first.
+    """
+    now = datetime.datetime.now()
+    months = []
+    for i in range(num_months):
+        month = (now - datetime.timedelta(days=30 * i)).replace(day=1)
+        months.append(month.strftime("%Y-%m"))
+    return months
+
+
 def build_ledger(
     bc_customers: list[dict[str, typing.Any]],
     journal_entries: list[dict[str, typing.Any]],
@@ -434,47 +527,22 @@ def build_ledger(
     Build a general ledger for BC customers with audit fields and entity structure.
     """
     ledger: list[dict[str, typing.Any]] = []
-    now = datetime.datetime.now()
-    months = []
-    for i in range(5):
-        month = (now - datetime.timedelta(days=30 * i)).replace(day=1)
-        months.append(month.strftime("%Y-%m"))
+    months = ledger_months()
 
     for customer in bc_customers:
-        account_number = customer["account_number"]
-        entity_code = random.choice(ENTITY_CODES)
-        territory = random.choice(TERRITORIES)
-        business_unit = random.choice(BUSINESS_UNITS)
-        consolidation_group = random.choice(CONSOLIDATION_GROUPS)
+        customer_dims = build_customer_dims(customer["account_number"])
         used_months = random.sample(months, k=random.randint(1, len(months)))
         for month in used_months:
             used_accounts = random.sample(accounts, k=random.randint(1, len(accounts)))
             for acc in used_accounts:
-                year, m = map(int, month.split("-"))
-                day = random.randint(1, 28)
-                date = f"{year}-{m:02d}-{day:02d}"
-                currency = random.choice(CURRENCIES)
-                amount = round(random.uniform(100, 10000), 2)
                 journal_entry = random.choice(journal_entries)
-                journal_id = journal_entry["journal_id"]
-                is_adjustment_entry = random.random() < 0.05
-                is_manual = random.random() < 0.1
                 ledger.append(
-                    {
-                        "id": str(uuid.uuid4()),
-                        "journal_id": journal_id,
-                        "account_number": account_number,
-                        "account_code": acc["account_code"],
-                        "date": date,
-                        "currency": currency,
-                        "amount": amount,
-                        "entity_code": entity_code,
-                        "territory": territory,
-                        "business_unit": business_unit,
-                        "consolidation_group": consolidation_group,
-                        "is_adjustment_entry": is_adjustment_entry,
-                        "is_manual": is_manual,
-                    }
+                    build_ledger_line(
+                        customer_dims,
+                        journal_entry["journal_id"],
+                        acc["account_code"],
+                        month,
+                    )
                 )
     return ledger
 
@@ -495,11 +563,7 @@ def build_fx_rates() -> list[dict[str, typing.Any]]:
             ...
         ]
     """
-    now = datetime.datetime.now()
-    months = []
-    for i in range(5):
-        month = (now - datetime.timedelta(days=30 * i)).replace(day=1)
-        months.append(month.strftime("%Y-%m"))
+    months = ledger_months()
 
     fx_rates: list[dict[str, typing.Any]] = []
     for month in months:
@@ -523,31 +587,103 @@ def build_fx_rates() -> list[dict[str, typing.Any]]:
     return fx_rates
 
 
-def routine():
+def write_indexed(
+    rows: list[dict[str, typing.Any]],
+    output_dir: Path,
+    name: str,
+    keys: dict[str, typing.Callable[[dict], typing.Any]],
+) -> None:
+    """
+    Write rows to <output_dir>/<name>.jsonl, one JSON object per line, and for every key an index
+    <output_dir>/index/<name>_by_<key>.json mapping each key value to [start, end) byte ranges in the data file.
+    Adjacent rows with the same key value share one range, so a customer's ledger lines are usually a single read.
+
+    Example:
+        >>> write_indexed(ledger, Path("data"), "ledger_lines", INDEX_KEYS["ledger_lines"])
+        data/index/ledger_lines_by_account_number.json:
+        {"data_file": "ledger_lines.jsonl", "key": "account_number", "ranges": {"10001": [[0, 4180]], ...}}
+    """
+    (output_dir / "index").mkdir(parents=True, exist_ok=True)
+    ranges: dict[str, dict[str, list[list[int]]]] = {key: {} for key in keys}
+    position = 0
+    with open(output_dir / f"{name}.jsonl", "wb") as file:
+        for row in rows:
+            line = (json.dumps(row) + "\n").encode("utf-8")
+            file.write(line)
+            end = position + len(line)
+            for key, key_of in keys.items():
+                key_ranges = ranges[key].setdefault(str(key_of(row)), [])
+                if key_ranges and key_ranges[-1][1] == position:
+                    key_ranges[-1][1] = end
+                else:
+                    key_ranges.append([position, end])
+            position = end
+
+    for key, key_ranges in ranges.items():
+        with open(output_dir / "index" / f"{name}_by_{key}.json", "w", encoding="utf-8") as file:
+            json.dump({"data_file": f"{name}.jsonl", "key": key, "ranges": key_ranges}, file)
+
+
+def lookup(
+    data_dir: str, name: str, key: str, value: typing.Any
+) -> list[dict[str, typing.Any]]:
+    """
+    Return the rows of <name>.jsonl whose key equals value, using the index written by write_indexed.
+
+    Example:
+        >>> lookup("data", "ledger_lines", "month", "2025-06")
+        [{"id": "...", "journal_id": "...", "account_number": 10001, ...}, ...]
+    """
+    with open(Path(data_dir) / "index" / f"{name}_by_{key}.json", "r", encoding="utf-8") as file:
+        index = json.load(file)
+    rows: list[dict[str, typing.Any]] = []
+    with open(Path(data_dir) / index["data_file"], "rb") as file:
+        for start, end in index["ranges"].get(str(value), []):
+            file.seek(start)
+            rows.extend(json.loads(line) for line in file.read(end - start).splitlines())
+    return rows
+
+
+def routine(
+    num_customers: int = ACCOUNT_NUMBER_RANGE["max"] - ACCOUNT_NUMBER_RANGE["min"],
+    num_journal_entries: int = 500,
+    output_path: str = "data/mock_data.json",
+    write_indexes: bool = True,
+):
     """
     Generate mock data for Salesforce customers, BC global customers, and BC general ledger.
-    Data is written to data/mock_data.json.
+    Data is written to data/mock_data.json unless another output_path is given.
+
+    Args:
+        num_customers (int): Number of customers, starting at ACCOUNT_NUMBER_RANGE["min"].
+        num_journal_entries (int): Number of journal entries the ledger lines are spread over.
+        output_path (str): Path of the JSON file to write.
+        write_indexes (bool): Also write JSON lines files and key indexes next to it (see write_indexed),
+            plus SMALL_TABLES_FILE with the remaining tables.
     """
     salesforce_payload: list[typing.Any] = []
     businesscentral_payload: list[typing.Any] = []
 
+    first_account_number: int = ACCOUNT_NUMBER_RANGE["min"]
+    last_account_number: int = first_account_number + num_customers
+
     sf_account_numbers: set[int] = set()
-    for account_number in range(
-        ACCOUNT_NUMBER_RANGE["min"], ACCOUNT_NUMBER_RANGE["max"]
-    ):
+    for account_number in range(first_account_number, last_account_number):
         sf_payload = build_salesforce(account_number)
         salesforce_payload.append(sf_payload)
         sf_account_numbers.add(account_number)
 
-    for account_number in range(
-        ACCOUNT_NUMBER_RANGE["min"], ACCOUNT_NUMBER_RANGE["max"]
-    ):
-        bc_payload = build_businesscentral(account_number, sf_account_numbers)
+    for account_number in range(first_account_number, last_account_number):
+        bc_payload = build_businesscentral(
+            account_number,
+            sf_account_numbers,
+            max(last_account_number, ACCOUNT_NUMBER_RANGE["max"]),
+        )
         businesscentral_payload.append(bc_payload)
 
     accounts_payload = build_accounts_table()
     fx_rates_payload = build_fx_rates()
-    journal_entries_payload = build_journal_entries(num_entries=500)
+    journal_entries_payload = build_journal_entries(num_entries=num_journal_entries)
 
     ledger_payload = build_ledger(
         businesscentral_payload,
@@ -592,12 +728,29 @@ def routine():
         "consolidation_groups": consolidation_groups_table,
     }
 
-    if not Path("data").exists():
-        Path("data").mkdir()
+    if not Path(output_path).parent.exists():
+        Path(output_path).parent.mkdir(parents=True)
 
-    with open("data/mock_data.json", "w", encoding="utf-8") as file:
+    with open(output_path, "w", encoding="utf-8") as file:
         json.dump(output_dict, file, indent=4)
 
+    if write_indexes:
+        indexed_rows: dict[str, list[dict[str, typing.Any]]] = {
+            "ledger_lines": ledger_payload,
+            "salesforce_customers": salesforce_payload,
+            "business_central_global_customers": businesscentral_payload,
+        }
+        for name, keys in INDEX_KEYS.items():
+            write_indexed(indexed_rows[name], Path(output_path).parent, name, keys)
+
+        small_tables = {
+            key: value
+            for key, value in output_dict.items()
+            if key not in ("salesforce", "business_central", "ledger")
+        }
+        with open(Path(output_path).parent / SMALL_TABLES_FILE, "w", encoding="utf-8") as file:
+            json.dump(small_tables, file)
+
 
 if __name__ == "__main__":
     if Path("data/mock_data.json").exists():
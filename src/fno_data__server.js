@@ -32,6 +32,37 @@ app.use((req, res, next) => {
     next();
 });
 
+// Keyed lookups through the index files written by build_mock.py, e.g.
+// /lookup/ledger_lines/account_number/10001 or /lookup/ledger_lines/month/2025-06
+const indexCache = {};
+app.get('/lookup/:dataset/:key/:value', (req, res) => {
+    const { dataset, key, value } = req.params;
+    if (!/^[a-z_]+$/.test(dataset) || !/^[a-z_]+$/.test(key)) return res.status(404).send('Not Found');
+    const indexPath = `./data/index/${dataset}_by_${key}.json`;
+    if (!indexCache[indexPath]) {
+        if (!fs.existsSync(indexPath)) return res.status(404).send('Not Found');
+        indexCache[indexPath] = JSON.parse(fs.readFileSync(indexPath, 'utf8'));
+    }
+    const index = indexCache[indexPath];
+    // Only the index's own keys: "__proto__" or "constructor" must not resolve to inherited properties
+    if (!Object.prototype.hasOwnProperty.call(index.ranges, value)) return res.status(404).send('Not Found');
+    const ranges = index.ranges[value];
+    const fd = fs.openSync(`./data/${index.data_file}`, 'r');
+    try {
+        const rows = [];
+        for (const [start, end] of ranges) {
+            const buffer = Buffer.alloc(end - start);
+            fs.readSync(fd, buffer, 0, end - start, start);
+            for (const line of buffer.toString('utf8').split('\n')) {
+                if (line) rows.push(JSON.parse(line));
+            }
+        }
+        res.json(rows);
+    } finally {
+        fs.closeSync(fd);
+    }
+});
+
 // List all top-level categories
 app.get('/', (req, res) => {
     res.json(Object.keys(jsonData));
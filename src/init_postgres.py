@@ -4,14 +4,29 @@ Initializes and loads mock data into PostgreSQL from mock_data.json.
 - Creates all required tables if they do not exist.
 - Loads data from /docker-entrypoint-initdb.d/data/mock_data.json into each table.
 - Uses psycopg2 for database operations.
+- With --resumable, commits every --batch-size rows and records a per-table checkpoint in
+  load_checkpoints, so a load interrupted by a restart or dropped connection resumes where it stopped.
+- With one or more --target DSN [SCHEMA], parses and batches mock_data.json once and loads it into
+  every target concurrently (one writer thread per target), then prints a per-target summary.
+- With --row-hash, adds a row_hash column to the customer and dimension tables for the hash-based dbt
+  snapshots (dbt/macros/row_hash.sql, var precomputed_row_hash), fills it for rows that have none yet and
+  installs a BEFORE INSERT OR UPDATE trigger that keeps it current, whichever loader or client writes the rows.
+  Without it, no trigger is added, so the loads pay no per-row hashing.
 
 Author: Mews.FnO.Data
 """
 
+import argparse
 import json
-from typing import Any, List
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List, Optional
 
 import psycopg2
+import psycopg2.extras
+from psycopg2 import sql
 
 DB_HOST: str = "localhost"
 DB_PORT: int = 5432
@@ -21,20 +36,80 @@ DB_PASS: str = "prodpassword"
 
 DATA_PATH: str = "/docker-entrypoint-initdb.d/data/mock_data.json"
 
-print("Initializing PostgreSQL database with mock data...")
+BATCH_SIZE: int = 10000
+CONNECT_RETRIES: int = 5
+CONNECT_BACKOFF: float = 1.0
 
+# Table -> (path of its rows in mock_data.json, columns to load), in load order.
+TABLES: dict[str, tuple[tuple[str, ...], List[str]]] = {
+    "salesforce_customers": (
+        ("salesforce", "customers"),
+        [
+            "id",
+            "is_deleted",
+            "account_number",
+            "name",
+            "billing_country",
+            "capacity_s",
+            "capacity_m",
+            "capacity_l",
+        ],
+    ),
+    "business_central_global_customers": (
+        ("business_central", "global_customers"),
+        ["id", "account_number", "currency", "country_code"],
+    ),
+    "ledger": (
+        ("ledger", "lines"),
+        [
+            "id",
+            "journal_id",
+            "account_number",
+            "account_code",
+            "date",
+            "currency",
+            "amount",
+            "entity_code",
+            "territory",
+            "business_unit",
+            "consolidation_group",
+            "is_adjustment_entry",
+            "is_manual",
+        ],
+    ),
+    "fx_rates": (("fx_rates", "rates"), ["month", "currency", "rate_to_eur"]),
+    "journal_entries": (
+        ("journal_entries", "entries"),
+        ["journal_id", "source_system", "posted_by", "status", "posted_at"],
+    ),
+    "accounts": (
+        ("accounts", "dimension"),
+        [
+            "account_code",
+            "account_name",
+            "account_type",
+            "reporting_group",
+            "is_pl_account",
+        ],
+    ),
+    "entity_codes": (("entity_codes",), ["entity_code", "description", "created_at"]),
+    "territories": (
+        ("territories",),
+        ["territory", "description", "region", "country_group"],
+    ),
+    "business_units": (
+        ("business_units",),
+        ["business_unit", "description", "unit_type", "manager"],
+    ),
+    "consolidation_groups": (
+        ("consolidation_groups",),
+        ["consolidation_group", "description", "group_type", "lead_entity"],
+    ),
+}
 
-def get_conn() -> psycopg2.extensions.connection:
-    """Establish a connection to the PostgreSQL database."""
-    return psycopg2.connect(
-        host=DB_HOST, port=DB_PORT, dbname=DB_NAME, user=DB_USER, password=DB_PASS
-    )
-
-
-def create_tables(cur: psycopg2.extensions.cursor) -> None:
-    """Create all required tables if they do not exist."""
-    cur.execute(
-        """
+# Table -> CREATE TABLE statement, in the order of TABLES.
+TABLE_DDL: dict[str, str] = {
+    "salesforce_customers": """
     CREATE TABLE IF NOT EXISTS salesforce_customers (
         id VARCHAR(64) PRIMARY KEY,
         is_deleted BOOLEAN,
@@ -45,20 +120,16 @@ def create_tables(cur: psycopg2.extensions.cursor) -> None:
         capacity_m INTEGER,
         capacity_l INTEGER
     );
-    """
-    )
-    cur.execute(
-        """
+    """,
+    "business_central_global_customers": """
     CREATE TABLE IF NOT EXISTS business_central_global_customers (
         id UUID PRIMARY KEY,
         account_number INTEGER,
         currency VARCHAR(3),
         country_code VARCHAR(2)
     );
-    """
-    )
-    cur.execute(
-        """
+    """,
+    "ledger": """
     CREATE TABLE IF NOT EXISTS ledger (
         id VARCHAR(64) PRIMARY KEY,
         journal_id VARCHAR(64),
@@ -74,19 +145,15 @@ def create_tables(cur: psycopg2.extensions.cursor) -> None:
         is_adjustment_entry BOOLEAN,
         is_manual BOOLEAN
     );
-    """
-    )
-    cur.execute(
-        """
+    """,
+    "fx_rates": """
     CREATE TABLE IF NOT EXISTS fx_rates (
         month VARCHAR(7),
         currency VARCHAR(3),
         rate_to_eur FLOAT
     );
-    """
-    )
-    cur.execute(
-        """
+    """,
+    "journal_entries": """
     CREATE TABLE IF NOT EXISTS journal_entries (
         journal_id VARCHAR(64) PRIMARY KEY,
         source_system VARCHAR(32),
@@ -94,10 +161,8 @@ def create_tables(cur: psycopg2.extensions.cursor) -> None:
         status VARCHAR(16),
         posted_at TIMESTAMP
     );
-    """
-    )
-    cur.execute(
-        """
+    """,
+    "accounts": """
     CREATE TABLE IF NOT EXISTS accounts (
         account_code VARCHAR(16) PRIMARY KEY,
         account_name TEXT,
@@ -105,49 +170,94 @@ def create_tables(cur: psycopg2.extensions.cursor) -> None:
         reporting_group VARCHAR(32),
         is_pl_account BOOLEAN
     );
-    """
-    )
-    cur.execute(
-        """
+    """,
+    "entity_codes": """
     CREATE TABLE IF NOT EXISTS entity_codes (
         entity_code VARCHAR(16) PRIMARY KEY,
         description TEXT,
         created_at DATE
     );
-    """
-    )
-    cur.execute(
-        """
+    """,
+    "territories": """
     CREATE TABLE IF NOT EXISTS territories (
         territory VARCHAR(8) PRIMARY KEY,
         description TEXT,
         region VARCHAR(16),
         country_group VARCHAR(16)
     );
-    """
-    )
-    cur.execute(
-        """
+    """,
+    "business_units": """
     CREATE TABLE IF NOT EXISTS business_units (
         business_unit VARCHAR(16) PRIMARY KEY,
         description TEXT,
         unit_type VARCHAR(32),
         manager VARCHAR(32)
     );
-    """
-    )
-    cur.execute(
-        """
+    """,
+    "consolidation_groups": """
     CREATE TABLE IF NOT EXISTS consolidation_groups (
         consolidation_group VARCHAR(16) PRIMARY KEY,
         description TEXT,
         group_type VARCHAR(32),
         lead_entity VARCHAR(16)
     );
-    """
+    """,
+}
+
+# Table -> columns hashed into its row_hash column; must match the snapshot_columns calls in dbt/snapshots.
+ROW_HASH_COLUMNS: dict[str, List[str]] = {
+    "salesforce_customers": [
+        "is_deleted",
+        "account_number",
+        "name",
+        "billing_country",
+        "capacity_s",
+        "capacity_m",
+        "capacity_l",
+    ],
+    "business_central_global_customers": ["account_number", "currency", "country_code"],
+    "accounts": ["account_name", "account_type", "reporting_group", "is_pl_account"],
+    "entity_codes": ["description", "created_at"],
+    "territories": ["description", "region", "country_group"],
+    "business_units": ["description", "unit_type", "manager"],
+    "consolidation_groups": ["description", "group_type", "lead_entity"],
+}
+
+
+def get_conn(dsn: Optional[str] = None) -> psycopg2.extensions.connection:
+    """Establish a connection to the PostgreSQL database (the defaults above unless a DSN is given)."""
+    if dsn:
+        return psycopg2.connect(dsn)
+    return psycopg2.connect(
+        host=DB_HOST, port=DB_PORT, dbname=DB_NAME, user=DB_USER, password=DB_PASS
     )
 
 
+def get_conn_with_retry(
+    dsn: Optional[str] = None,
+    retries: int = CONNECT_RETRIES,
+    backoff: float = CONNECT_BACKOFF,
+) -> psycopg2.extensions.connection:
+    """Connect with get_conn(), retrying with exponential backoff while the database is unreachable."""
+    attempt = 0
+    while True:
+        try:
+            return get_conn(dsn)
+        except psycopg2.OperationalError as ex:
+            if attempt >= retries:
+                raise
+            delay = backoff * 2**attempt
+            print(f"Connection failed ({ex}). Retrying in {delay:.0f}s...")
+            time.sleep(delay)
+            attempt += 1
+
+
+def create_tables(cur: psycopg2.extensions.cursor, row_hash: bool = False) -> None:
+    """Create all required tables if they do not exist; with row_hash, also their row_hash columns and triggers."""
+    for statement in ddl_statements(row_hash):
+        cur.execute(statement)
+
+
 def insert_many(
     cur: psycopg2.extensions.cursor, table: str, rows: List[dict], columns: List[str]
 ) -> None:
@@ -164,6 +274,258 @@ def insert_many(
         cur.execute(sql, values)
 
 
+def table_values(rows: List[dict], columns: List[str]) -> List[list]:
+    """Extract column values from rows, skipping rows without any value (as insert_many does)."""
+    values = ([row.get(col) for col in columns] for row in rows)
+    return [v for v in values if not all(x is None for x in v)]
+
+
+def insert_values(
+    cur: psycopg2.extensions.cursor, table: str, columns: List[str], values: List[list]
+) -> None:
+    """Insert pre-extracted rows in multi-row INSERT statements."""
+    if not values:
+        return
+    sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES %s ON CONFLICT DO NOTHING"
+    psycopg2.extras.execute_values(cur, sql, values, page_size=1000)
+
+
+def row_hash_expression(columns: List[str]) -> str:
+    """SQL for the row hash; the same expression as the row_hash_expression dbt macro."""
+    parts = ", ".join(f"COALESCE(CAST({col} AS TEXT), '\\N')" for col in columns)
+    return f"MD5(CONCAT_WS('|', {parts}))"
+
+
+def row_hash_trigger_ddl(table: str, columns: List[str]) -> List[str]:
+    """
+    Statements adding the row_hash column to a table (also to tables created before it existed), filling it
+    for rows without one, and creating the trigger that sets it on every INSERT or UPDATE.
+    """
+    expression = row_hash_expression([f"NEW.{col}" for col in columns])
+    return [
+        f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS row_hash CHAR(32)",
+        f"UPDATE {table} SET row_hash = {row_hash_expression(columns)} WHERE row_hash IS NULL",
+        f"""
+    CREATE OR REPLACE FUNCTION {table}_row_hash() RETURNS trigger AS $$
+    BEGIN
+        NEW.row_hash := {expression};
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql;
+    """,
+        f"DROP TRIGGER IF EXISTS {table}_row_hash ON {table}",
+        f"CREATE TRIGGER {table}_row_hash BEFORE INSERT OR UPDATE ON {table} "
+        f"FOR EACH ROW EXECUTE FUNCTION {table}_row_hash()",
+    ]
+
+
+def ddl_statements(row_hash: bool = False) -> List[str]:
+    """All statements create_tables executes: TABLE_DDL, then with row_hash the row_hash columns and triggers."""
+    statements = list(TABLE_DDL.values())
+    if row_hash:
+        for table, columns in ROW_HASH_COLUMNS.items():
+            statements.extend(row_hash_trigger_ddl(table, columns))
+    return statements
+
+
+def create_checkpoint_table(cur: psycopg2.extensions.cursor) -> None:
+    """Create the control table holding per-table progress of resumable loads."""
+    cur.execute(
+        """
+    CREATE TABLE IF NOT EXISTS load_checkpoints (
+        table_name VARCHAR(64) PRIMARY KEY,
+        source VARCHAR(512),
+        rows_loaded INTEGER,
+        batches_loaded INTEGER,
+        updated_at TIMESTAMP DEFAULT now()
+    );
+    """
+    )
+
+
+def data_fingerprint(data_path: str) -> str:
+    """Identify a data file, so checkpoints of a previous dataset are not resumed against a new one."""
+    stat = os.stat(data_path)
+    return f"{os.path.abspath(data_path)}:{stat.st_size}:{int(stat.st_mtime)}"
+
+
+def get_checkpoint(cur: psycopg2.extensions.cursor, table: str, source: str) -> tuple[int, int]:
+    """Return (rows_loaded, batches_loaded) for a table, or zeros if it has no checkpoint for source."""
+    cur.execute(
+        "SELECT rows_loaded, batches_loaded FROM load_checkpoints WHERE table_name = %s AND source = %s",
+        (table, source),
+    )
+    row = cur.fetchone()
+    return (row[0], row[1]) if row else (0, 0)
+
+
+def set_checkpoint(cur: psycopg2.extensions.cursor, table: str, source: str, rows: int, batches: int) -> None:
+    """Record a table's progress; called inside the transaction that inserts the batch."""
+    cur.execute(
+        """
+        INSERT INTO load_checkpoints (table_name, source, rows_loaded, batches_loaded, updated_at)
+        VALUES (%s, %s, %s, %s, now())
+        ON CONFLICT (table_name) DO UPDATE
+        SET source = EXCLUDED.source,
+            rows_loaded = EXCLUDED.rows_loaded,
+            batches_loaded = EXCLUDED.batches_loaded,
+            updated_at = EXCLUDED.updated_at
+        """,
+        (table, source, rows, batches),
+    )
+
+
+def load_table_resumable(
+    conn: psycopg2.extensions.connection,
+    table: str,
+    rows: List[dict],
+    columns: List[str],
+    source: str,
+    batch_size: int,
+) -> int:
+    """
+    Load a table from its checkpoint onwards, committing each batch together with the checkpoint.
+    Returns the number of rows loaded in this run.
+    """
+    cur = conn.cursor()
+    offset, batches = get_checkpoint(cur, table, source)
+    conn.commit()
+    if offset:
+        print(f"Resuming {table} at row {offset} of {len(rows)} (batch {batches}).")
+    start = offset
+    while offset < len(rows):
+        batch = rows[offset : offset + batch_size]
+        insert_values(cur, table, columns, table_values(batch, columns))
+        offset += len(batch)
+        batches += 1
+        set_checkpoint(cur, table, source, offset, batches)
+        conn.commit()
+    cur.close()
+    return offset - start
+
+
+def main_resumable(
+    data_path: str = DATA_PATH,
+    dsn: Optional[str] = None,
+    batch_size: int = BATCH_SIZE,
+    retries: int = CONNECT_RETRIES,
+    row_hash: bool = False,
+) -> None:
+    """
+    Load all tables in batches with per-table checkpoints.
+    A dropped connection is retried and the load resumes from the last committed batch;
+    rerunning after a crash does the same. A table is given up after more than retries failures
+    in a row without a committed batch in between.
+    """
+    with open(data_path, "r", encoding="utf-8") as f:
+        data: dict[str, Any] = json.load(f)
+    source = data_fingerprint(data_path)
+
+    conn = get_conn_with_retry(dsn, retries)
+    cur = conn.cursor()
+    create_tables(cur, row_hash)
+    create_checkpoint_table(cur)
+    conn.commit()
+    cur.close()
+
+    for table, (_, columns) in TABLES.items():
+        failures = 0
+        checkpoint: Optional[tuple[int, int]] = None
+        while True:
+            try:
+                loaded = load_table_resumable(conn, table, table_rows(data, table), columns, source, batch_size)
+                print(f"{table}: {loaded} rows loaded.")
+                break
+            except (psycopg2.OperationalError, psycopg2.InterfaceError) as ex:
+                print(f"Lost connection while loading {table} ({ex}). Reconnecting...")
+                if not conn.closed:
+                    conn.close()
+                conn = get_conn_with_retry(dsn, retries)
+                cur = conn.cursor()
+                reached = get_checkpoint(cur, table, source)
+                conn.commit()
+                cur.close()
+                # Only failures without progress since the previous one count towards giving up.
+                failures = 1 if reached != checkpoint else failures + 1
+                checkpoint = reached
+                if failures > retries:
+                    conn.close()
+                    raise
+
+    conn.close()
+    print("All tables loaded.")
+
+
+def mask_password(dsn: str) -> str:
+    """Hide the password of a key/value or URL DSN, for printing."""
+    dsn = re.sub(r"password=\S+", "password=***", dsn)
+    return re.sub(r"(://[^:/@]+:)[^@]+@", r"\1***@", dsn)
+
+
+def load_target(
+    dsn: str,
+    schema: Optional[str],
+    batches: List[tuple[str, List[str], List[List[list]]]],
+    row_hash: bool = False,
+) -> dict[str, Any]:
+    """Load pre-batched rows into one target in a single transaction and return its summary."""
+    started = time.monotonic()
+    summary: dict[str, Any] = {"target": mask_password(dsn), "schema": schema or "public", "rows": {}}
+    try:
+        conn = get_conn_with_retry(dsn)
+        try:
+            cur = conn.cursor()
+            if schema:
+                cur.execute(sql.SQL("CREATE SCHEMA IF NOT EXISTS {}").format(sql.Identifier(schema)))
+                cur.execute(sql.SQL("SET search_path TO {}").format(sql.Identifier(schema)))
+            create_tables(cur, row_hash)
+            for table, columns, chunks in batches:
+                for chunk in chunks:
+                    insert_values(cur, table, columns, chunk)
+                summary["rows"][table] = sum(len(chunk) for chunk in chunks)
+            conn.commit()
+            cur.close()
+        finally:
+            conn.close()
+        summary["status"] = "ok"
+    except psycopg2.Error as ex:
+        summary["status"] = f"failed: {ex}".strip()
+    summary["seconds"] = time.monotonic() - started
+    return summary
+
+
+def main_fanout(
+    targets: List[tuple[str, Optional[str]]],
+    data_path: str = DATA_PATH,
+    batch_size: int = BATCH_SIZE,
+    row_hash: bool = False,
+) -> List[dict[str, Any]]:
+    """
+    Parse mock_data.json and split it into batches once, then load the same batches into every target.
+    A failing target does not stop the others; its error is reported in the summary.
+    """
+    with open(data_path, "r", encoding="utf-8") as f:
+        data: dict[str, Any] = json.load(f)
+
+    batches: List[tuple[str, List[str], List[List[list]]]] = []
+    for table, (_, columns) in TABLES.items():
+        values = table_values(table_rows(data, table), columns)
+        chunks = [values[i : i + batch_size] for i in range(0, len(values), batch_size)]
+        batches.append((table, columns, chunks))
+    del data
+
+    with ThreadPoolExecutor(max_workers=len(targets)) as executor:
+        summaries = list(executor.map(lambda target: load_target(*target, batches, row_hash), targets))
+
+    for summary in summaries:
+        total = sum(summary["rows"].values())
+        print(
+            f"{summary['target']} [{summary['schema']}]: {summary['status']}, "
+            f"{total} rows in {summary['seconds']:.1f}s"
+        )
+    return summaries
+
+
 def insert_dimension(cur, table: str, column: str, values: list[str]) -> None:
     """Insert unique values into a dimension table."""
     sql = f"INSERT INTO {table} ({column}) VALUES (%s) ON CONFLICT DO NOTHING"
@@ -171,109 +533,25 @@ def insert_dimension(cur, table: str, column: str, values: list[str]) -> None:
         cur.execute(sql, (v,))
 
 
-def main() -> None:
+def table_rows(data: dict[str, Any], table: str) -> List[dict]:
+    """Return the rows of mock_data.json that load into the given table."""
+    rows: Any = data
+    for key in TABLES[table][0]:
+        rows = rows[key]
+    return rows
+
+
+def main(data_path: str = DATA_PATH, dsn: Optional[str] = None, row_hash: bool = False) -> None:
     """Main routine to load all tables from mock_data.json into PostgreSQL."""
-    with open(DATA_PATH, "r", encoding="utf-8") as f:
+    with open(data_path, "r", encoding="utf-8") as f:
         data: dict[str, Any] = json.load(f)
 
-    conn = get_conn()
+    conn = get_conn(dsn)
     cur = conn.cursor()
-    create_tables(cur)
+    create_tables(cur, row_hash)
 
-    # Insert salesforce_customers
-    sf_rows = data["salesforce"]["customers"]
-    sf_cols = [
-        "id",
-        "is_deleted",
-        "account_number",
-        "name",
-        "billing_country",
-        "capacity_s",
-        "capacity_m",
-        "capacity_l",
-    ]
-    insert_many(cur, "salesforce_customers", sf_rows, sf_cols)
-
-    # Insert business_central_global_customers
-    bc_rows = data["business_central"]["global_customers"]
-    bc_cols = ["id", "account_number", "currency", "country_code"]
-    insert_many(cur, "business_central_global_customers", bc_rows, bc_cols)
-
-    # Insert ledger
-    ledger_rows = data["ledger"]["lines"]
-    ledger_cols = [
-        "id",
-        "journal_id",
-        "account_number",
-        "account_code",
-        "date",
-        "currency",
-        "amount",
-        "entity_code",
-        "territory",
-        "business_unit",
-        "consolidation_group",
-        "is_adjustment_entry",
-        "is_manual",
-    ]
-    insert_many(cur, "ledger", ledger_rows, ledger_cols)
-
-    # Insert fx_rates
-    fx_rows = data["fx_rates"]["rates"]
-    fx_cols = ["month", "currency", "rate_to_eur"]
-    insert_many(cur, "fx_rates", fx_rows, fx_cols)
-
-    # Insert journal_entries
-    je_rows = data["journal_entries"]["entries"]
-    je_cols = ["journal_id", "source_system", "posted_by", "status", "posted_at"]
-    insert_many(cur, "journal_entries", je_rows, je_cols)
-
-    # Insert accounts
-    acc_rows = data["accounts"]["dimension"]
-    acc_cols = [
-        "account_code",
-        "account_name",
-        "account_type",
-        "reporting_group",
-        "is_pl_account",
-    ]
-    insert_many(cur, "accounts", acc_rows, acc_cols)
-
-    # Insert entity_codes, territories, business_units, consolidation_groups with metadata
-    entity_codes_rows = data["entity_codes"]
-    entity_codes_cols = [
-        "entity_code",
-        "description",
-        "created_at",
-    ]
-    insert_many(cur, "entity_codes", entity_codes_rows, entity_codes_cols)
-
-    territories_rows = data["territories"]
-    territories_cols = ["territory", "description", "region", "country_group"]
-    insert_many(cur, "territories", territories_rows, territories_cols)
-
-    business_units_rows = data["business_units"]
-    business_units_cols = [
-        "business_unit",
-        "description",
-        "unit_type",
-        "manager",
-    ]
-    insert_many(cur, "business_units", business_units_rows, business_units_cols)
-
-    consolidation_groups_rows = data["consolidation_groups"]
-    consolidation_groups_cols = [
-        "consolidation_group",
-        "description",
-        "group_type",
-        "lead_entity",
-    ]
-    insert_many(
-        cur,
-        "consolidation_groups",
-        consolidation_groups_rows,
-        consolidation_groups_cols,
-    )
+    for table, (_, columns) in TABLES.items():
+        insert_many(cur, table, table_rows(data, table), columns)
 
     conn.commit()
     cur.close()
@@ -282,4 +560,36 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Load mock_data.json into PostgreSQL.")
+    parser.add_argument("--data", default=DATA_PATH, help="Path of mock_data.json.")
+    parser.add_argument("--dsn", default=None, help="Connection string (defaults to the settings above).")
+    parser.add_argument("--resumable", action="store_true", help="Commit in batches and resume from checkpoints.")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="Rows per committed batch or statement group.")
+    parser.add_argument(
+        "--target",
+        action="append",
+        nargs="+",
+        default=[],
+        metavar=("DSN", "SCHEMA"),
+        help="DSN and optional schema to load into; repeat to fan the same data out to several targets.",
+    )
+    parser.add_argument(
+        "--row-hash",
+        action="store_true",
+        help="Keep a row_hash column, set by a trigger, for the dbt var precomputed_row_hash.",
+    )
+    args = parser.parse_args()
+    if any(len(target) > 2 for target in args.target):
+        parser.error("--target takes a DSN and at most one schema")
+    if args.target and (args.resumable or args.dsn):
+        parser.error("--target cannot be combined with --resumable or --dsn")
+
+    print("Initializing PostgreSQL database with mock data...")
+
+    if args.target:
+        targets = [(target[0], target[1] if len(target) > 1 else None) for target in args.target]
+        main_fanout(targets, args.data, args.batch_size, args.row_hash)
+    elif args.resumable:
+        main_resumable(args.data, args.dsn, args.batch_size, row_hash=args.row_hash)
+    else:
+        main(args.data, args.dsn, args.row_hash)
@@ -0,0 +1,197 @@
+"""
+Loads mock data into PostgreSQL with asyncio and psycopg 3 pipeline mode.
+
+- Uses the same table/column mapping (init_postgres.TABLES) and DDL (init_postgres.ddl_statements) as init_postgres.
+- Several connections write concurrently; on each one, the INSERTs of a chunk are sent in pipeline mode,
+  so they do not wait for the reply of the previous statement. Load time stops scaling with RTT x rows.
+- Decoding runs in a worker thread and feeds a bounded queue, so parsing the next chunk overlaps the
+  network writes of the previous ones. Ledger lines and customers are streamed from the JSON lines files
+  build_mock writes next to mock_data.json, the other tables are read from its small_tables.json. Those
+  files are used for all tables or for none: only if every one exists and none is older than --data, so
+  files left by an earlier generation are ignored. Otherwise everything is read from --data, still parsed
+  and chunked off the event loop.
+- The connections commit only once every writer has finished. If one fails, the others are cancelled and
+  nothing is committed; rerun the load. Only a failure during the final commits can leave part of the rows
+  committed, which a rerun completes, since every INSERT uses ON CONFLICT DO NOTHING.
+- Needs psycopg 3 (pip install "psycopg[binary]") in addition to psycopg2.
+
+To see the effect locally, add latency to the loopback interface before loading:
+    $ sudo tc qdisc add dev lo root netem delay 25ms
+    $ sudo tc qdisc del dev lo root
+
+Usage:
+    $ python init_postgres_async.py --data data/mock_data.json --connections 4
+
+Author: Mews.FnO.Data
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import time
+from pathlib import Path
+from typing import IO, Any, List, Optional
+
+import psycopg
+
+import build_mock
+import init_postgres
+
+CONNECTIONS: int = 4
+CHUNK_SIZE: int = 1000
+QUEUE_CHUNKS: int = 16
+
+# Tables streamed from the JSON lines files written by build_mock.write_indexed.
+JSONL_FILES: dict[str, str] = {
+    "salesforce_customers": "salesforce_customers",
+    "business_central_global_customers": "business_central_global_customers",
+    "ledger": "ledger_lines",
+}
+
+def default_conninfo() -> str:
+    """Connection string for the defaults defined in init_postgres."""
+    return (
+        f"host={init_postgres.DB_HOST} port={init_postgres.DB_PORT} dbname={init_postgres.DB_NAME} "
+        f"user={init_postgres.DB_USER} password={init_postgres.DB_PASS}"
+    )
+
+
+def load_json(data_path: str) -> dict[str, Any]:
+    with open(data_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def decode_chunk(file: IO[str], columns: List[str], chunk_size: int) -> List[list]:
+    """Decode the next chunk_size JSON lines into column values."""
+    return init_postgres.table_values([json.loads(line) for line in itertools.islice(file, chunk_size)], columns)
+
+
+def table_chunks(data: dict[str, Any], table: str, columns: List[str], chunk_size: int) -> List[List[list]]:
+    """Extract a table's column values from parsed JSON data, split into chunks of chunk_size rows."""
+    values = init_postgres.table_values(init_postgres.table_rows(data, table), columns)
+    return [values[i : i + chunk_size] for i in range(0, len(values), chunk_size)]
+
+
+def jsonl_paths(data_path: str) -> dict[str, Path]:
+    """
+    Return table -> JSON lines file next to data_path, or an empty dict unless these files and
+    build_mock.SMALL_TABLES_FILE all exist and none is older than data_path (build_mock writes them after it).
+    """
+    data_dir = Path(data_path).parent
+    paths = {table: data_dir / f"{name}.jsonl" for table, name in JSONL_FILES.items()}
+    files = [*paths.values(), data_dir / build_mock.SMALL_TABLES_FILE]
+    if not all(path.exists() for path in files):
+        return {}
+    data_mtime = Path(data_path).stat().st_mtime
+    return paths if all(path.stat().st_mtime >= data_mtime for path in files) else {}
+
+
+async def create_tables(conninfo: str, row_hash: bool = False) -> None:
+    async with await psycopg.AsyncConnection.connect(conninfo) as conn:
+        for statement in init_postgres.ddl_statements(row_hash):
+            await conn.execute(statement)
+
+
+async def produce(queue: asyncio.Queue, data_path: str, chunk_size: int, writers: int) -> None:
+    """Decode every table into chunks of column values and queue them, then signal the writers to stop."""
+    paths = jsonl_paths(data_path)
+    if paths:
+        source = str(Path(data_path).parent / build_mock.SMALL_TABLES_FILE)
+    else:
+        source = data_path
+    # The tables not streamed from a JSON lines file all come from this one file, parsed in a worker thread.
+    data = await asyncio.to_thread(load_json, source)
+
+    for table, (_, columns) in init_postgres.TABLES.items():
+        if table in paths:
+            with open(paths[table], "r", encoding="utf-8") as file:
+                while True:
+                    values = await asyncio.to_thread(decode_chunk, file, columns, chunk_size)
+                    if not values:
+                        break
+                    await queue.put((table, columns, values))
+        else:
+            for values in await asyncio.to_thread(table_chunks, data, table, columns, chunk_size):
+                await queue.put((table, columns, values))
+    del data
+
+    for _ in range(writers):
+        await queue.put(None)
+
+
+async def write(queue: asyncio.Queue, conn: psycopg.AsyncConnection, loaded: dict[str, int]) -> None:
+    """Take chunks off the queue and send each one's INSERTs in pipeline mode, without committing."""
+    async with conn.cursor() as cur:
+        while True:
+            item = await queue.get()
+            if item is None:
+                break
+            table, columns, values = item
+            placeholders = ", ".join(["%s"] * len(columns))
+            sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders}) ON CONFLICT DO NOTHING"
+            async with conn.pipeline():
+                await cur.executemany(sql, values)
+            loaded[table] = loaded.get(table, 0) + len(values)
+
+
+async def load(
+    data_path: str,
+    conninfo: str,
+    connections: int = CONNECTIONS,
+    chunk_size: int = CHUNK_SIZE,
+    row_hash: bool = False,
+) -> dict[str, int]:
+    """
+    Create the tables, then decode and write concurrently, and commit once all writers are done.
+    Returns rows sent per table.
+    """
+    await create_tables(conninfo, row_hash)
+    queue: asyncio.Queue = asyncio.Queue(maxsize=QUEUE_CHUNKS)
+    loaded: dict[str, int] = {}
+    conns = [await psycopg.AsyncConnection.connect(conninfo) for _ in range(connections)]
+    tasks = [
+        asyncio.ensure_future(produce(queue, data_path, chunk_size, connections)),
+        *(asyncio.ensure_future(write(queue, conn, loaded)) for conn in conns),
+    ]
+    try:
+        await asyncio.gather(*tasks)
+        for conn in conns:
+            await conn.commit()
+    finally:
+        # After a failure, stop the other tasks; closing a connection rolls back what it did not commit.
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for conn in conns:
+            await conn.close()
+    return loaded
+
+
+def main(
+    data_path: str = init_postgres.DATA_PATH,
+    dsn: Optional[str] = None,
+    connections: int = CONNECTIONS,
+    chunk_size: int = CHUNK_SIZE,
+    row_hash: bool = False,
+) -> None:
+    """Main routine to load all tables from mock_data.json into PostgreSQL."""
+    started = time.monotonic()
+    loaded = asyncio.run(load(data_path, dsn or default_conninfo(), connections, chunk_size, row_hash))
+    for table in init_postgres.TABLES:
+        print(f"{table}: {loaded.get(table, 0)} rows")
+    print(f"All tables loaded in {time.monotonic() - started:.1f}s.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load mock_data.json into PostgreSQL with pipelined asyncio writers.")
+    parser.add_argument("--data", default=init_postgres.DATA_PATH, help="Path of mock_data.json.")
+    parser.add_argument("--dsn", default=None, help="Connection string (defaults to init_postgres settings).")
+    parser.add_argument("--connections", type=int, default=CONNECTIONS, help="Concurrent writer connections.")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="Rows per pipelined chunk.")
+    parser.add_argument(
+        "--row-hash", action="store_true", help="Keep a row_hash column, set by a trigger (see init_postgres)."
+    )
+    args = parser.parse_args()
+
+    main(args.data, args.dsn, args.connections, args.chunk_size, args.row_hash)
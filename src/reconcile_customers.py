@@ -0,0 +1,211 @@
+"""
+Reconciles Salesforce customers against Business Central global customers.
+
+- Builds a hash index keyed on account_number for each system, then classifies every account number
+  in one pass over the union of both indexes:
+    matched           in both systems, not deleted, billing country equal to the BC country code
+    sf_only           only in Salesforce
+    bc_only           only in Business Central (build_businesscentral moves ~10% of customers there)
+    deleted           flagged is_deleted in Salesforce
+    country_conflict  in both systems with a different (or missing) Salesforce billing country
+  Further records sharing an account number within one system are reported as sf_duplicate / bc_duplicate.
+- Reads the customers from mock_data.json, or from the loaded tables with --from-db.
+- Prints a summary of counts per status and, with --load, writes the detail rows to the
+  customer_reconciliation table with COPY.
+
+Usage:
+    $ python reconcile_customers.py --data data/mock_data.json
+    $ python reconcile_customers.py --from-db --load
+
+Author: Mews.FnO.Data
+"""
+
+import argparse
+import collections
+import csv
+import io
+import json
+import time
+from typing import Any, Iterable, Optional
+
+import psycopg2
+
+import init_postgres
+
+STATUSES: list[str] = [
+    "matched",
+    "sf_only",
+    "bc_only",
+    "deleted",
+    "country_conflict",
+    "sf_duplicate",
+    "bc_duplicate",
+]
+
+DETAIL_COLUMNS: list[str] = [
+    "account_number",
+    "status",
+    "sf_id",
+    "bc_id",
+    "sf_billing_country",
+    "bc_country_code",
+    "sf_name_missing",
+]
+
+SF_COLUMNS: list[str] = ["id", "account_number", "is_deleted", "name", "billing_country"]
+BC_COLUMNS: list[str] = ["id", "account_number", "country_code"]
+
+
+def build_index(rows: Iterable[tuple], duplicates: list[tuple]) -> dict[Any, tuple]:
+    """Index rows (account_number second) by account number; rows with an already indexed key go to duplicates."""
+    index: dict[Any, tuple] = {}
+    for row in rows:
+        key = row[1]
+        if key in index:
+            duplicates.append(row)
+        else:
+            index[key] = row
+    return index
+
+
+def classify(sf_row: Optional[tuple], bc_row: Optional[tuple]) -> str:
+    """Classify one account number from its Salesforce (SF_COLUMNS) and BC (BC_COLUMNS) rows."""
+    if sf_row is None:
+        return "bc_only"
+    if sf_row[2]:
+        return "deleted"
+    if bc_row is None:
+        return "sf_only"
+    if sf_row[4] != bc_row[2]:
+        return "country_conflict"
+    return "matched"
+
+
+def detail_row(status: str, sf_row: Optional[tuple], bc_row: Optional[tuple]) -> tuple:
+    account_number = sf_row[1] if sf_row is not None else bc_row[1]
+    return (
+        account_number,
+        status,
+        sf_row[0] if sf_row is not None else None,
+        bc_row[0] if bc_row is not None else None,
+        sf_row[4] if sf_row is not None else None,
+        bc_row[2] if bc_row is not None else None,
+        sf_row[3] is None if sf_row is not None else None,
+    )
+
+
+def reconcile(sf_rows: Iterable[tuple], bc_rows: Iterable[tuple]) -> tuple[dict[str, int], list[tuple]]:
+    """
+    Reconcile Salesforce rows (SF_COLUMNS order) with BC rows (BC_COLUMNS order).
+    Returns the count per status and the detail rows (DETAIL_COLUMNS order).
+    """
+    sf_duplicates: list[tuple] = []
+    bc_duplicates: list[tuple] = []
+    sf_index = build_index(sf_rows, sf_duplicates)
+    bc_index = build_index(bc_rows, bc_duplicates)
+
+    details: list[tuple] = []
+    for account_number, sf_row in sf_index.items():
+        bc_row = bc_index.get(account_number)
+        details.append(detail_row(classify(sf_row, bc_row), sf_row, bc_row))
+    for account_number, bc_row in bc_index.items():
+        if account_number not in sf_index:
+            details.append(detail_row("bc_only", None, bc_row))
+    details.extend(detail_row("sf_duplicate", row, None) for row in sf_duplicates)
+    details.extend(detail_row("bc_duplicate", None, row) for row in bc_duplicates)
+
+    counts = collections.Counter(row[1] for row in details)
+    summary = {status: counts.get(status, 0) for status in STATUSES}
+    summary["sf_name_missing"] = sum(1 for row in details if row[6])
+    return summary, details
+
+
+def rows_from_json(data_path: str) -> tuple[list[tuple], list[tuple]]:
+    """Read both customer sets from mock_data.json as tuples."""
+    with open(data_path, "r", encoding="utf-8") as f:
+        data: dict[str, Any] = json.load(f)
+    sf = [tuple(r.get(c) for c in SF_COLUMNS) for r in init_postgres.table_rows(data, "salesforce_customers")]
+    bc = [
+        tuple(r.get(c) for c in BC_COLUMNS)
+        for r in init_postgres.table_rows(data, "business_central_global_customers")
+    ]
+    return sf, bc
+
+
+def rows_from_db(conn: psycopg2.extensions.connection) -> tuple[list[tuple], list[tuple]]:
+    """Read both customer sets from the loaded tables as tuples."""
+    cur = conn.cursor()
+    cur.execute(f"SELECT {', '.join(SF_COLUMNS)} FROM salesforce_customers")
+    sf = cur.fetchall()
+    # UUIDs come back as text, like the ids in mock_data.json.
+    cur.execute("SELECT id::text, account_number, country_code FROM business_central_global_customers")
+    bc = cur.fetchall()
+    cur.close()
+    return sf, bc
+
+
+def load_details(conn: psycopg2.extensions.connection, details: list[tuple]) -> None:
+    """Replace the contents of customer_reconciliation with the detail rows, using COPY."""
+    cur = conn.cursor()
+    cur.execute(
+        """
+    CREATE TABLE IF NOT EXISTS customer_reconciliation (
+        account_number INTEGER,
+        status VARCHAR(32),
+        sf_id VARCHAR(64),
+        bc_id UUID,
+        sf_billing_country VARCHAR(2),
+        bc_country_code VARCHAR(2),
+        sf_name_missing BOOLEAN
+    );
+    """
+    )
+    cur.execute("TRUNCATE customer_reconciliation")
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in details:
+        writer.writerow(["\\N" if v is None else v for v in row])
+    buffer.seek(0)
+    cur.copy_expert(
+        f"COPY customer_reconciliation ({', '.join(DETAIL_COLUMNS)}) FROM STDIN WITH (FORMAT csv, NULL '\\N')",
+        buffer,
+    )
+    conn.commit()
+    cur.close()
+
+
+def main(
+    data_path: str = init_postgres.DATA_PATH,
+    from_db: bool = False,
+    load: bool = False,
+    dsn: Optional[str] = None,
+) -> dict[str, int]:
+    """Reconcile the customer sets, print the summary and optionally load the details."""
+    conn = init_postgres.get_conn_with_retry(dsn) if from_db or load else None
+    sf, bc = rows_from_db(conn) if from_db else rows_from_json(data_path)
+
+    started = time.monotonic()
+    summary, details = reconcile(sf, bc)
+    elapsed = time.monotonic() - started
+
+    print(f"Reconciled {len(sf)} Salesforce and {len(bc)} Business Central customers in {elapsed:.2f}s")
+    for status, count in summary.items():
+        print(f"  {status}: {count}")
+
+    if conn is not None:
+        if load:
+            load_details(conn, details)
+            print(f"Loaded {len(details)} rows into customer_reconciliation.")
+        conn.close()
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Reconcile Salesforce and Business Central customers.")
+    parser.add_argument("--data", default=init_postgres.DATA_PATH, help="Path of mock_data.json.")
+    parser.add_argument("--from-db", action="store_true", help="Read customers from PostgreSQL instead.")
+    parser.add_argument("--load", action="store_true", help="Write the detail rows to customer_reconciliation.")
+    parser.add_argument("--dsn", default=None, help="Connection string (defaults to init_postgres settings).")
+    args = parser.parse_args()
+
+    main(args.data, args.from_db, args.load, args.dsn)
@@ -0,0 +1,137 @@
+"""
+Builds a stratified sample of the loaded mock data in its own schema for fast dbt development.
+
+- Ledger lines are sampled per stratum (month, entity_code, currency, is_adjustment_entry): each stratum
+  keeps --fraction of its lines, and at least --min-per-stratum, so rare combinations are never lost.
+- Sampling is deterministic (lines are ranked by md5 of their id), so repeated runs give the same sample.
+- Every customer and journal entry referenced by a sampled line is kept, so joins stay complete;
+  a hash-sampled share of the remaining customers is kept too, so SF-only, BC-only and deleted
+  customers are still represented.
+- Small tables (fx_rates, accounts and the dimension tables) are copied in full.
+- dbt reads the sample instead of public with: dbt run --vars '{use_sample: true}'
+
+Usage:
+    $ python sample_postgres.py --fraction 0.02
+
+Author: Mews.FnO.Data
+"""
+
+import argparse
+from typing import Optional
+
+import psycopg2
+
+import init_postgres
+
+SAMPLE_SCHEMA: str = "mock_data_sample"
+SOURCE_SCHEMA: str = "public"
+
+FRACTION: float = 0.02
+MIN_PER_STRATUM: int = 5
+
+STRATA: list[str] = [
+    "to_char(date, 'YYYY-MM')",
+    "entity_code",
+    "currency",
+    "is_adjustment_entry",
+]
+
+FULL_COPY_TABLES: list[str] = [
+    "fx_rates",
+    "accounts",
+    "entity_codes",
+    "territories",
+    "business_units",
+    "consolidation_groups",
+]
+
+# Maps the first 32 bits of md5(key) onto [0, 1) for deterministic hash sampling.
+HASH_UNIT: str = "(('x' || substr(md5({key}::text), 1, 8))::bit(32)::bigint / 4294967296.0)"
+
+
+def create_sample_tables(cur: psycopg2.extensions.cursor) -> None:
+    """Recreate the sample schema with empty copies of all source tables."""
+    cur.execute(f"DROP SCHEMA IF EXISTS {SAMPLE_SCHEMA} CASCADE")
+    cur.execute(f"CREATE SCHEMA {SAMPLE_SCHEMA}")
+    for table in init_postgres.TABLES:
+        cur.execute(f"CREATE TABLE {SAMPLE_SCHEMA}.{table} (LIKE {SOURCE_SCHEMA}.{table} INCLUDING ALL)")
+
+
+def sample_ledger(cur: psycopg2.extensions.cursor, fraction: float, min_per_stratum: int) -> None:
+    """Copy the stratified sample of ledger lines."""
+    columns = ", ".join(init_postgres.TABLES["ledger"][1])
+    strata = ", ".join(STRATA)
+    cur.execute(
+        f"""
+        INSERT INTO {SAMPLE_SCHEMA}.ledger ({columns})
+        SELECT {columns}
+        FROM (
+            SELECT
+                l.*,
+                row_number() OVER (PARTITION BY {strata} ORDER BY md5(id)) AS stratum_rank,
+                count(*) OVER (PARTITION BY {strata}) AS stratum_size
+            FROM {SOURCE_SCHEMA}.ledger AS l
+        ) AS ranked
+        WHERE stratum_rank <= greatest(%(min_per_stratum)s, ceil(stratum_size * %(fraction)s))
+        """,
+        {"fraction": fraction, "min_per_stratum": min_per_stratum},
+    )
+
+
+def sample_referenced(cur: psycopg2.extensions.cursor, fraction: float) -> None:
+    """Copy the journal entries and customers the sampled ledger refers to, plus a hash sample of customers."""
+    cur.execute(
+        f"""
+        INSERT INTO {SAMPLE_SCHEMA}.journal_entries
+        SELECT je.*
+        FROM {SOURCE_SCHEMA}.journal_entries AS je
+        WHERE je.journal_id IN (SELECT journal_id FROM {SAMPLE_SCHEMA}.ledger)
+        """
+    )
+    for table in ["salesforce_customers", "business_central_global_customers"]:
+        cur.execute(
+            f"""
+            INSERT INTO {SAMPLE_SCHEMA}.{table}
+            SELECT c.*
+            FROM {SOURCE_SCHEMA}.{table} AS c
+            WHERE c.account_number IN (SELECT account_number FROM {SAMPLE_SCHEMA}.ledger)
+                OR {HASH_UNIT.format(key="c.id")} < %(fraction)s
+            """,
+            {"fraction": fraction},
+        )
+
+
+def main(
+    fraction: float = FRACTION,
+    min_per_stratum: int = MIN_PER_STRATUM,
+    dsn: Optional[str] = None,
+) -> None:
+    """Rebuild the sample schema from the loaded source tables and print its row counts."""
+    conn = init_postgres.get_conn_with_retry(dsn)
+    cur = conn.cursor()
+    create_sample_tables(cur)
+    sample_ledger(cur, fraction, min_per_stratum)
+    sample_referenced(cur, fraction)
+    for table in FULL_COPY_TABLES:
+        cur.execute(f"INSERT INTO {SAMPLE_SCHEMA}.{table} SELECT * FROM {SOURCE_SCHEMA}.{table}")
+    conn.commit()
+
+    conn.autocommit = True
+    for table in init_postgres.TABLES:
+        cur.execute(f"ANALYZE {SAMPLE_SCHEMA}.{table}")
+        cur.execute(f"SELECT count(*) FROM {SAMPLE_SCHEMA}.{table}")
+        sampled = cur.fetchone()[0]
+        cur.execute(f"SELECT count(*) FROM {SOURCE_SCHEMA}.{table}")
+        print(f"{table}: {sampled} of {cur.fetchone()[0]} rows")
+    cur.close()
+    conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build a stratified sample of the mock data for dbt dev runs.")
+    parser.add_argument("--fraction", type=float, default=FRACTION, help="Share of each stratum to keep.")
+    parser.add_argument("--min-per-stratum", type=int, default=MIN_PER_STRATUM, help="Lines kept per stratum.")
+    parser.add_argument("--dsn", default=None, help="Connection string (defaults to init_postgres settings).")
+    args = parser.parse_args()
+
+    main(args.fraction, args.min_per_stratum, args.dsn)
@@ -0,0 +1,166 @@
+"""
+Tails the micro-batches written by stream_mock.py and loads them into PostgreSQL.
+
+- Polls the spool directory and loads every complete batch file, oldest first.
+- Each poll commits all pending batches in a single transaction, so no batch waits longer than
+  one poll interval plus one commit before it is visible.
+- Records every committed batch in the stream_batches control table, keyed by (run_id, batch_id) of the
+  simulator run, with emitted_at and committed_at (clock_timestamp() of the last statement before the commit,
+  in the same transaction as the rows), which lets dbt models compare their freshness to the ingest stream.
+- Processed files are moved to the done/ subdirectory, so a restarted loader picks up where it stopped.
+- Prints sustained throughput and emit-to-commit latency when stopped, measured once each commit has returned.
+
+Usage:
+    $ python stream_loader.py --spool data/stream --poll-interval 0.5
+
+Author: Mews.FnO.Data
+"""
+
+import argparse
+import datetime
+import json
+import os
+import statistics
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+import psycopg2
+
+import init_postgres
+
+SPOOL_DIR: str = "data/stream"
+
+
+def create_control_table(cur: psycopg2.extensions.cursor) -> None:
+    """Create the table recording every committed micro-batch."""
+    cur.execute(
+        """
+    CREATE TABLE IF NOT EXISTS stream_batches (
+        run_id VARCHAR(32),
+        batch_id INTEGER,
+        emitted_at TIMESTAMP,
+        committed_at TIMESTAMP,
+        ledger_rows INTEGER,
+        journal_rows INTEGER,
+        PRIMARY KEY (run_id, batch_id)
+    );
+    """
+    )
+
+
+def pending_batches(spool_dir: Path, max_batches: int) -> list[Path]:
+    """List up to max_batches complete batch files in emit order."""
+    return sorted(spool_dir.glob("batch_*.json"))[:max_batches]
+
+
+def load_batches(conn: psycopg2.extensions.connection, paths: list[Path]) -> list[dict[str, Any]]:
+    """
+    Insert the given batch files and their stream_batches rows in one transaction and return per-batch stats.
+    The committed_at of the stats is taken once the commit has returned, so the reported latency includes it.
+    """
+    cur = conn.cursor()
+    stats: list[dict[str, Any]] = []
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            batch = json.load(f)
+        init_postgres.insert_many(
+            cur, "journal_entries", batch["journal_entries"], init_postgres.TABLES["journal_entries"][1]
+        )
+        init_postgres.insert_many(cur, "ledger", batch["ledger_lines"], init_postgres.TABLES["ledger"][1])
+        stats.append(
+            {
+                "run_id": batch["run_id"],
+                "batch_id": batch["batch_id"],
+                "emitted_at": datetime.datetime.fromisoformat(batch["emitted_at"]),
+                "ledger_rows": len(batch["ledger_lines"]),
+                "journal_rows": len(batch["journal_entries"]),
+            }
+        )
+
+    # ON CONFLICT only skips a batch replayed after a crash between the commit and moving its file to done/.
+    for s in stats:
+        cur.execute(
+            "INSERT INTO stream_batches (run_id, batch_id, emitted_at, committed_at, ledger_rows, journal_rows) "
+            "VALUES (%s, %s, %s, clock_timestamp(), %s, %s) ON CONFLICT DO NOTHING",
+            (s["run_id"], s["batch_id"], s["emitted_at"], s["ledger_rows"], s["journal_rows"]),
+        )
+    conn.commit()
+
+    committed_at = datetime.datetime.now()
+    for s in stats:
+        s["committed_at"] = committed_at
+    cur.close()
+
+    done_dir = paths[0].parent / "done"
+    done_dir.mkdir(exist_ok=True)
+    for path in paths:
+        os.replace(path, done_dir / path.name)
+    return stats
+
+
+def report(stats: list[dict[str, Any]], elapsed: float) -> None:
+    """Print sustained throughput and emit-to-commit latency of the loaded batches."""
+    if not stats:
+        print("No batches loaded.")
+        return
+    rows = sum(s["ledger_rows"] for s in stats)
+    latencies = sorted((s["committed_at"] - s["emitted_at"]).total_seconds() for s in stats)
+    p50 = statistics.median(latencies)
+    p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+    print(
+        f"Loaded {len(stats)} batches, {rows} ledger rows in {elapsed:.1f}s "
+        f"({rows / elapsed:.0f} rows/s). Latency p50 {p50:.3f}s, p95 {p95:.3f}s, max {latencies[-1]:.3f}s"
+    )
+
+
+def main(
+    spool_dir: str = SPOOL_DIR,
+    poll_interval: float = 0.5,
+    max_batches: int = 50,
+    idle_timeout: Optional[float] = None,
+    dsn: Optional[str] = None,
+) -> None:
+    """Load micro-batches until interrupted, or until no batch arrived for idle_timeout seconds."""
+    spool = Path(spool_dir)
+    spool.mkdir(parents=True, exist_ok=True)
+    conn = init_postgres.get_conn(dsn)
+    cur = conn.cursor()
+    init_postgres.create_tables(cur)
+    create_control_table(cur)
+    conn.commit()
+    cur.close()
+
+    stats: list[dict[str, Any]] = []
+    started = time.monotonic()
+    last_batch = started
+    try:
+        while True:
+            poll_started = time.monotonic()
+            paths = pending_batches(spool, max_batches)
+            if paths:
+                stats.extend(load_batches(conn, paths))
+                last_batch = time.monotonic()
+                # A full poll means the loader is behind: go again without sleeping.
+                if len(paths) == max_batches:
+                    continue
+            elif idle_timeout is not None and poll_started - last_batch >= idle_timeout:
+                break
+            time.sleep(max(0.0, poll_interval - (time.monotonic() - poll_started)))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        conn.close()
+        report(stats, time.monotonic() - started)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load streamed micro-batches into PostgreSQL.")
+    parser.add_argument("--spool", default=SPOOL_DIR, help="Directory stream_mock.py writes to.")
+    parser.add_argument("--poll-interval", type=float, default=0.5, help="Seconds between polls.")
+    parser.add_argument("--max-batches", type=int, default=50, help="Most batches committed per transaction.")
+    parser.add_argument("--idle-timeout", type=float, default=None, help="Stop after this many idle seconds.")
+    parser.add_argument("--dsn", default=None, help="Connection string (defaults to init_postgres settings).")
+    args = parser.parse_args()
+
+    main(args.spool, args.poll_interval, args.max_batches, args.idle_timeout, args.dsn)
@@ -0,0 +1,211 @@
+"""
+Simulates continuous posting into the general ledger as a stream of micro-batches.
+
+- Builds on the build_mock builders: customers come from an existing mock_data.json (or are generated),
+  journal entries and ledger lines are produced with build_journal_entries and build_ledger_line.
+- Emits ledger lines at a configurable rate (lines per second), grouped into one micro-batch per interval.
+- A share of lines arrives late (dated in an earlier month), and a share corrects a recently emitted line
+  with a reversal plus a rebooked line, both flagged with is_adjustment_entry.
+- Each micro-batch is written atomically to the spool directory as batch_<run_id>_<sequence>.json,
+  ready for stream_loader.py to pick up. The run_id (start time plus a random suffix) keeps the files
+  and batch keys of several runs into one spool apart, and sorts runs in start order.
+
+Usage:
+    $ python stream_mock.py --rate 500 --interval 1 --duration 60 --spool data/stream
+
+Author: Mews.FnO.Data
+"""
+
+import argparse
+import collections
+import datetime
+import json
+import os
+import random
+import time
+import typing
+import uuid
+from pathlib import Path
+
+import build_mock
+
+SPOOL_DIR: str = "data/stream"
+DATA_PATH: str = "data/mock_data.json"
+
+LINES_PER_JOURNAL: int = 20
+RECENT_LINES: int = 10000
+
+
+def load_customers(data_path: str = DATA_PATH, num_customers: int = 2000) -> list[dict[str, typing.Any]]:
+    """
+    Return the entity structure of the customers to post for.
+    BC customers are read from data_path when it exists so streamed lines match the batch load,
+    otherwise num_customers new ones are generated.
+    """
+    if Path(data_path).exists():
+        with open(data_path, "r", encoding="utf-8") as f:
+            account_numbers = [c["account_number"] for c in json.load(f)["business_central"]["global_customers"]]
+    else:
+        first = build_mock.ACCOUNT_NUMBER_RANGE["min"]
+        account_numbers = list(range(first, first + num_customers))
+    return [build_mock.build_customer_dims(account_number) for account_number in account_numbers]
+
+
+def build_correction(line: dict[str, typing.Any], journal_id: str) -> list[dict[str, typing.Any]]:
+    """
+    Correct a previously emitted line: reverse it and rebook it with a different amount.
+    Both lines are adjustment entries dated like the original and posted under journal_id.
+    """
+    reversal = dict(line)
+    reversal.update(
+        {
+            "id": str(uuid.uuid4()),
+            "journal_id": journal_id,
+            "amount": -line["amount"],
+            "is_adjustment_entry": True,
+        }
+    )
+    rebooked = dict(line)
+    rebooked.update(
+        {
+            "id": str(uuid.uuid4()),
+            "journal_id": journal_id,
+            "amount": round(line["amount"] * random.uniform(0.9, 1.1), 2),
+            "is_adjustment_entry": True,
+        }
+    )
+    return [reversal, rebooked]
+
+
+def new_run_id() -> str:
+    """
+    Identify a simulator run: its start time (sortable) and a random suffix.
+    """
+    return f"{datetime.datetime.now():%Y%m%d%H%M%S}{uuid.uuid4().hex[:6]}"
+
+
+def stream_batches(
+    customers: list[dict[str, typing.Any]],
+    lines_per_batch: int,
+    late_ratio: float = 0.05,
+    correction_ratio: float = 0.02,
+    run_id: typing.Optional[str] = None,
+) -> typing.Iterator[dict[str, typing.Any]]:
+    """
+    Endlessly yield micro-batches of journal entries and ledger lines.
+
+    Args:
+        customers: Customer entity structures, as returned by load_customers.
+        lines_per_batch: Number of new (non-correcting) ledger lines per batch.
+        late_ratio: Share of lines dated in an earlier month than the current one.
+        correction_ratio: Share of lines that trigger a reversal and rebooking of a recent line.
+        run_id: Run the batches belong to (a new one if not given); batch_id counts from 0 within it.
+
+    Yields:
+        dict: {"run_id", "batch_id", "emitted_at", "journal_entries", "ledger_lines"}
+    """
+    run_id = run_id or new_run_id()
+    months = build_mock.ledger_months()
+    account_codes = [acc["account_code"] for acc in build_mock.build_accounts_table()]
+    recent: collections.deque = collections.deque(maxlen=RECENT_LINES)
+    sequence = 0
+
+    while True:
+        now = datetime.datetime.now()
+        journal_entries = build_mock.build_journal_entries(max(1, -(-lines_per_batch // LINES_PER_JOURNAL)))
+        for entry in journal_entries:
+            entry["posted_at"] = now.strftime("%Y-%m-%d %H:%M:%S")
+        journal_ids = [entry["journal_id"] for entry in journal_entries]
+
+        ledger_lines: list[dict[str, typing.Any]] = []
+        for i in range(lines_per_batch):
+            journal_id = journal_ids[i // LINES_PER_JOURNAL]
+            if recent and random.random() < correction_ratio:
+                ledger_lines.extend(build_correction(random.choice(recent), journal_id))
+            month = random.choice(months[1:]) if random.random() < late_ratio else months[0]
+            line = build_mock.build_ledger_line(
+                random.choice(customers),
+                journal_id,
+                random.choice(account_codes),
+                month,
+                is_adjustment_entry=False,
+            )
+            ledger_lines.append(line)
+            recent.append(line)
+
+        yield {
+            "run_id": run_id,
+            "batch_id": sequence,
+            "emitted_at": now.isoformat(),
+            "journal_entries": journal_entries,
+            "ledger_lines": ledger_lines,
+        }
+        sequence += 1
+
+
+def write_batch(spool_dir: Path, batch: dict[str, typing.Any]) -> Path:
+    """
+    Write a batch to the spool directory; the rename makes it visible to the loader only once complete.
+    """
+    path = spool_dir / f"batch_{batch['run_id']}_{batch['batch_id']:09d}.json"
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as file:
+        json.dump(batch, file)
+    os.replace(tmp_path, path)
+    return path
+
+
+def routine(
+    rate: float,
+    interval: float,
+    duration: typing.Optional[float],
+    spool_dir: str = SPOOL_DIR,
+    data_path: str = DATA_PATH,
+    late_ratio: float = 0.05,
+    correction_ratio: float = 0.02,
+) -> None:
+    """
+    Emit one micro-batch every interval seconds at rate lines per second, for duration seconds (or forever).
+    """
+    spool = Path(spool_dir)
+    spool.mkdir(parents=True, exist_ok=True)
+    lines_per_batch = max(1, round(rate * interval))
+    batches = stream_batches(load_customers(data_path), lines_per_batch, late_ratio, correction_ratio)
+
+    started = time.monotonic()
+    emitted_batches = 0
+    emitted_lines = 0
+    for batch in batches:
+        write_batch(spool, batch)
+        emitted_batches += 1
+        emitted_lines += len(batch["ledger_lines"])
+        elapsed = time.monotonic() - started
+        if duration is not None and elapsed >= duration:
+            break
+        # Schedule against the start time so slow batches do not make the stream drift below the rate.
+        time.sleep(max(0.0, emitted_batches * interval - elapsed))
+
+    elapsed = time.monotonic() - started
+    print(f"Emitted {emitted_batches} batches, {emitted_lines} ledger lines in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stream mock ledger postings as micro-batches.")
+    parser.add_argument("--rate", type=float, default=100.0, help="Ledger lines per second.")
+    parser.add_argument("--interval", type=float, default=1.0, help="Seconds between micro-batches.")
+    parser.add_argument("--duration", type=float, default=None, help="Stop after this many seconds.")
+    parser.add_argument("--spool", default=SPOOL_DIR, help="Directory the micro-batches are written to.")
+    parser.add_argument("--data", default=DATA_PATH, help="mock_data.json to take customers from.")
+    parser.add_argument("--late-ratio", type=float, default=0.05, help="Share of late-arriving lines.")
+    parser.add_argument("--correction-ratio", type=float, default=0.02, help="Share of correcting adjustments.")
+    args = parser.parse_args()
+
+    routine(
+        args.rate,
+        args.interval,
+        args.duration,
+        args.spool,
+        args.data,
+        args.late_ratio,
+        args.correction_ratio,
+    )
@@ -0,0 +1,273 @@
+"""
+Computes the EUR trial balance and P&L from the generated data, independently of dbt, for parity checks.
+
+- Converts ledger lines into columnar numpy arrays once, dictionary-encoding month, entity_code,
+  consolidation_group, account_code and currency into integer codes; the engine itself only sees numbers.
+- Converts amounts to EUR through a precomputed (month, currency) rate matrix: amount / rate_to_eur,
+  since fx_rates holds units of currency per EUR (EUR = 1.0). Lines without a rate are left out and counted.
+- Aggregates with np.bincount over a combined month x entity x consolidation group x account key,
+  so there is no per-row Python in the aggregation.
+- With --partitions N, lines are hashed on account_number into N partitions aggregated in parallel threads.
+- P&L per month x entity x consolidation group is derived from the trial balance using the accounts
+  dimension: revenue (reporting_group Revenue), expenses (reporting_group Expenses), net = revenue - expenses.
+- Prints the time spent reading mock_data.json, building the columns and aggregating, and the total.
+- With --compare RELATION, checks a dbt relation with columns (month, entity_code, consolidation_group,
+  account_code, amount_eur) against the trial balance and reports the cells that differ.
+
+Usage:
+    $ python trial_balance.py --data data/mock_data.json --output data/parity --partitions 4
+    $ python trial_balance.py --compare analytics.trial_balance_eur
+
+Author: Mews.FnO.Data
+"""
+
+import argparse
+import csv
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+import numpy as np
+
+DATA_PATH: str = "/docker-entrypoint-initdb.d/data/mock_data.json"
+
+DIMENSIONS: list[str] = ["month", "entity_code", "consolidation_group", "account_code"]
+
+TOLERANCE: float = 0.01
+
+
+def encode(values: Iterable[Any], count: int) -> tuple[np.ndarray, np.ndarray]:
+    """Dictionary-encode values into (int32 codes, array of distinct values in order of first appearance)."""
+    lookup: dict[Any, int] = {}
+    codes = np.fromiter((lookup.setdefault(v, len(lookup)) for v in values), dtype=np.int32, count=count)
+    return codes, np.array(list(lookup))
+
+
+def read_inputs(data_path: str) -> tuple[list[dict[str, Any]], list[dict[str, Any]], list[dict[str, Any]]]:
+    """Read (ledger lines, fx rates, accounts) from mock_data.json."""
+    with open(data_path, "r", encoding="utf-8") as f:
+        data: dict[str, Any] = json.load(f)
+    return data["ledger"]["lines"], data["fx_rates"]["rates"], data["accounts"]["dimension"]
+
+
+def ledger_columns(rows: list[dict[str, Any]]) -> dict[str, Any]:
+    """
+    Turn ledger lines into numpy arrays: (codes, labels) for every categorical column used by the engine,
+    plain arrays for account_number and amount.
+    """
+    n = len(rows)
+    return {
+        "month": encode((r["date"][:7] for r in rows), n),
+        "entity_code": encode((r["entity_code"] for r in rows), n),
+        "consolidation_group": encode((r["consolidation_group"] for r in rows), n),
+        "account_code": encode((r["account_code"] for r in rows), n),
+        "currency": encode((r["currency"] for r in rows), n),
+        "account_number": np.fromiter((r["account_number"] for r in rows), dtype=np.int64, count=n),
+        "amount": np.fromiter((r["amount"] for r in rows), dtype=np.float64, count=n),
+    }
+
+
+def rate_matrix(
+    fx_rates: list[dict[str, Any]], months: np.ndarray, currencies: np.ndarray
+) -> np.ndarray:
+    """Build rate[month_code, currency_code] from fx_rates; combinations without a rate are NaN."""
+    rates = np.full((len(months), len(currencies)), np.nan)
+    month_codes = {m: i for i, m in enumerate(months.tolist())}
+    currency_codes = {c: i for i, c in enumerate(currencies.tolist())}
+    for fx in fx_rates:
+        m = month_codes.get(fx["month"])
+        c = currency_codes.get(fx["currency"])
+        if m is not None and c is not None:
+            rates[m, c] = fx["rate_to_eur"]
+    return rates
+
+
+def partition_of(account_numbers: np.ndarray, partitions: int) -> np.ndarray:
+    """Hash account numbers (Knuth multiplicative hash, mod 2**32 by uint32 wrap-around) into partition numbers."""
+    return (account_numbers.astype(np.uint32) * np.uint32(2654435761)) % np.uint32(partitions)
+
+
+def _aggregate(
+    columns: dict[str, Any],
+    rates: np.ndarray,
+    shape: tuple[int, ...],
+    rows: Optional[np.ndarray] = None,
+) -> tuple[np.ndarray, np.ndarray, int]:
+    """
+    Convert to EUR and sum per cell for the given row positions (all rows if None).
+    Returns flat (amount_eur, line count) arrays over all cells and the number of lines without a rate.
+    """
+    take = (lambda a: a) if rows is None else (lambda a: a[rows])
+    codes = [take(columns[dim][0]) for dim in DIMENSIONS]
+    amount_eur = take(columns["amount"]) / rates[codes[0], take(columns["currency"][0])]
+    unconverted = np.isnan(amount_eur)
+    amount_eur[unconverted] = 0.0
+
+    size = int(np.prod(shape))
+    keys = np.ravel_multi_index(tuple(codes), shape)
+    return (
+        np.bincount(keys, weights=amount_eur, minlength=size),
+        np.bincount(keys, minlength=size),
+        int(unconverted.sum()),
+    )
+
+
+def trial_balance(
+    columns: dict[str, Any],
+    fx_rates: list[dict[str, Any]],
+    partitions: int = 1,
+) -> dict[str, Any]:
+    """
+    Aggregate EUR amounts per month x entity x consolidation group x account.
+    With partitions > 1, rows are hashed on account_number and the partitions are aggregated in
+    parallel threads (numpy releases the GIL for the gathers and arithmetic), then summed.
+
+    Returns:
+        dict: {"labels": one array of values per DIMENSIONS entry,
+               "amount_eur": balance cube shaped like the labels,
+               "lines": line count cube, "unconverted_lines": lines without an FX rate}
+    """
+    labels = [columns[dim][1] for dim in DIMENSIONS]
+    shape = tuple(len(values) for values in labels)
+    rates = rate_matrix(fx_rates, labels[0], columns["currency"][1])
+
+    if partitions > 1:
+        # One pass over the rows: a stable sort by partition number (a radix sort for 8 and 16 bit integers),
+        # split at the partition sizes.
+        part = partition_of(columns["account_number"], partitions).astype(np.min_scalar_type(partitions - 1))
+        order = np.argsort(part, kind="stable")
+        row_sets = np.split(order, np.bincount(part, minlength=partitions).cumsum()[:-1])
+        with ThreadPoolExecutor(max_workers=partitions) as executor:
+            results = list(executor.map(lambda rows: _aggregate(columns, rates, shape, rows), row_sets))
+        totals = np.sum([r[0] for r in results], axis=0)
+        counts = np.sum([r[1] for r in results], axis=0)
+        unconverted = sum(r[2] for r in results)
+    else:
+        totals, counts, unconverted = _aggregate(columns, rates, shape)
+
+    return {
+        "labels": labels,
+        "amount_eur": totals.reshape(shape),
+        "lines": counts.reshape(shape),
+        "unconverted_lines": unconverted,
+    }
+
+
+def profit_and_loss(balance: dict[str, Any], accounts: list[dict[str, Any]]) -> dict[str, np.ndarray]:
+    """Revenue, expenses and net income per month x entity x consolidation group from the trial balance."""
+    by_code = {a["account_code"]: a for a in accounts}
+    account_labels = balance["labels"][3].tolist()
+    is_revenue = np.array(
+        [by_code.get(c, {}).get("is_pl_account") and by_code[c]["reporting_group"] == "Revenue" for c in account_labels],
+        dtype=bool,
+    )
+    is_expense = np.array(
+        [by_code.get(c, {}).get("is_pl_account") and by_code[c]["reporting_group"] == "Expenses" for c in account_labels],
+        dtype=bool,
+    )
+    revenue = balance["amount_eur"][..., is_revenue].sum(axis=-1)
+    expenses = balance["amount_eur"][..., is_expense].sum(axis=-1)
+    return {"revenue": revenue, "expenses": expenses, "net_income": revenue - expenses}
+
+
+def balance_rows(balance: dict[str, Any]) -> list[tuple]:
+    """List the non-empty trial balance cells as (month, entity, group, account, amount_eur, lines)."""
+    cells = np.nonzero(balance["lines"])
+    labels = [values[idx].tolist() for values, idx in zip(balance["labels"], cells)]
+    amounts = balance["amount_eur"][cells].round(2).tolist()
+    lines = balance["lines"][cells].tolist()
+    return list(zip(*labels, amounts, lines))
+
+
+def pl_rows(balance: dict[str, Any], pl: dict[str, np.ndarray]) -> list[tuple]:
+    """List P&L cells with any lines as (month, entity, group, revenue, expenses, net_income)."""
+    cells = np.nonzero(balance["lines"].sum(axis=-1))
+    labels = [values[idx].tolist() for values, idx in zip(balance["labels"][:3], cells)]
+    return list(zip(*labels, *(pl[k][cells].round(2).tolist() for k in ["revenue", "expenses", "net_income"])))
+
+
+def write_csv(path: Path, header: list[str], rows: list[tuple]) -> None:
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+
+def compare_with_relation(
+    balance: dict[str, Any], relation: str, dsn: Optional[str] = None, tolerance: float = TOLERANCE
+) -> list[tuple]:
+    """Return (month, entity, group, account, expected, actual) for cells where the relation differs."""
+    # Imported here, so computing the trial balance does not need psycopg2.
+    import init_postgres
+
+    conn = init_postgres.get_conn_with_retry(dsn)
+    cur = conn.cursor()
+    cur.execute(f"SELECT {', '.join(DIMENSIONS)}, amount_eur FROM {relation}")
+    actual = {tuple(str(v) for v in row[:4]): float(row[4] or 0.0) for row in cur.fetchall()}
+    cur.close()
+    conn.close()
+
+    expected = {row[:4]: row[4] for row in balance_rows(balance)}
+    mismatches = []
+    for key in expected.keys() | actual.keys():
+        if abs(expected.get(key, 0.0) - actual.get(key, 0.0)) > tolerance:
+            mismatches.append((*key, expected.get(key), actual.get(key)))
+    return sorted(mismatches, key=lambda row: tuple(str(v) for v in row[:4]))
+
+
+def main(
+    data_path: str = DATA_PATH,
+    partitions: int = 1,
+    output_dir: Optional[str] = None,
+    compare: Optional[str] = None,
+    dsn: Optional[str] = None,
+) -> int:
+    """Compute the trial balance and P&L, write/compare them, and return the number of mismatches."""
+    started = time.monotonic()
+    lines, fx_rates, accounts = read_inputs(data_path)
+    read = time.monotonic()
+    columns = ledger_columns(lines)
+    encoded = time.monotonic()
+    balance = trial_balance(columns, fx_rates, partitions)
+    pl = profit_and_loss(balance, accounts)
+    finished = time.monotonic()
+
+    print(
+        f"{len(columns['amount'])} ledger lines: JSON read {read - started:.2f}s, "
+        f"columnar load {encoded - read:.2f}s, aggregation {finished - encoded:.2f}s "
+        f"({partitions} partition(s)), total {finished - started:.2f}s, "
+        f"{balance['unconverted_lines']} lines without FX rate"
+    )
+
+    if output_dir:
+        out = Path(output_dir)
+        out.mkdir(parents=True, exist_ok=True)
+        write_csv(out / "trial_balance.csv", DIMENSIONS + ["amount_eur", "lines"], balance_rows(balance))
+        write_csv(
+            out / "profit_and_loss.csv",
+            DIMENSIONS[:3] + ["revenue", "expenses", "net_income"],
+            pl_rows(balance, pl),
+        )
+        print(f"Wrote trial_balance.csv and profit_and_loss.csv to {out}")
+
+    mismatches: list[tuple] = []
+    if compare:
+        mismatches = compare_with_relation(balance, compare, dsn)
+        print(f"{compare}: {len(mismatches)} cell(s) differ by more than {TOLERANCE}")
+        for row in mismatches[:20]:
+            print("  ", row)
+    return len(mismatches)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Independent EUR trial balance and P&L for dbt parity checks.")
+    parser.add_argument("--data", default=DATA_PATH, help="Path of mock_data.json.")
+    parser.add_argument("--partitions", type=int, default=1, help="Threads to aggregate account partitions in.")
+    parser.add_argument("--output", default=None, help="Directory to write trial_balance.csv / profit_and_loss.csv.")
+    parser.add_argument("--compare", default=None, help="dbt relation to check against the trial balance.")
+    parser.add_argument("--dsn", default=None, help="Connection string (defaults to init_postgres settings).")
+    args = parser.parse_args()
+
+    raise SystemExit(1 if main(args.data, args.partitions, args.output, args.compare, args.dsn) else 0)